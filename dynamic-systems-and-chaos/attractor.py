@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+
+# Plot the Attractors of the Henon, Lozi, and Standard Maps
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import sys
+
+import matplotlib
+
+from lecache import Cache
+from lelib import VECTOR_MAPS, Attractor
+from leprofile import Profiler
+from utils import (
+    add_backend_arguments,
+    add_cache_arguments,
+    add_output_arguments,
+    argparser,
+    die,
+)
+
+
+def parse_args():
+    """This function parses and return arguments passed in"""
+    descr = "Plot the Attractors of the Henon, Lozi, and Standard Maps"
+    examples = """
+      %(prog)s
+      %(prog)s --map=lozi
+      %(prog)s --map=henon -p 1.2,0.3 -n 5000
+      %(prog)s --xrange=0.5:0.8 --yrange=0.1:0.25 -e 100000
+      %(prog)s --map=standard -p 1.5 -e 2000 -n 5000 --density=linear
+      %(prog)s --dpi 300 --output=henon.png"""
+
+    parser = argparser(descr, examples)
+
+    # By default, iterate 10000 random seeds 1100 times and do not plot
+    # the first 100 iterations
+    # By default select the Henon Map with a=1.4 and b=0.3
+
+    parser.add_argument(
+        "-m",
+        "--map",
+        action="store",
+        dest="map_name",
+        default="henon",
+        choices=list(VECTOR_MAPS),
+        help="select the desired map (%s)" % ", ".join(VECTOR_MAPS),
+    )
+    parser.add_argument(
+        "-p",
+        "--parameters",
+        action="store",
+        dest="params",
+        help="comma separated values of the parameters of the map "
+        "(default: %s)"
+        % "; ".join(
+            "%s: %s"
+            % (
+                name,
+                ",".join(
+                    "%s=%g" % item
+                    for item in zip(definition.parameters, definition.defaults)
+                ),
+            )
+            for name, definition in VECTOR_MAPS.items()
+        ),
+    )
+    parser.add_argument(
+        "--xrange",
+        action="store",
+        dest="x",
+        help="range of the first component of the states "
+        "(default: the entire range)",
+    )
+    parser.add_argument(
+        "--yrange",
+        action="store",
+        dest="y",
+        help="range of the second component of the states "
+        "(default: the entire range)",
+    )
+    parser.add_argument(
+        "-n",
+        "--steps",
+        action="store",
+        dest="n",
+        type=int,
+        default=1000,
+        help="number of plotted iterations of each orbit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-s",
+        "--skip",
+        action="store",
+        dest="s",
+        type=int,
+        default=100,
+        help="number of iterations to skip (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-e",
+        "--seeds",
+        action="store",
+        dest="seeds",
+        type=int,
+        default=10000,
+        help="number of orbits, starting from random seeds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        action="store",
+        dest="chunk_size",
+        type=int,
+        help="compute at most 'chunk_size' iterations at once (default: auto)",
+    )
+    parser.add_argument(
+        "--columns",
+        action="store",
+        dest="columns",
+        type=int,
+        help="number of columns of the density raster "
+        "(default: the pixel width of the plot)",
+    )
+    parser.add_argument(
+        "--rows",
+        action="store",
+        dest="rows",
+        type=int,
+        help="number of rows of the density raster "
+        "(default: the pixel height of the plot)",
+    )
+    parser.add_argument(
+        "-d",
+        "--density",
+        action="store",
+        dest="density",
+        default="log",
+        choices=["linear", "log"],
+        help="shading of the density of the states (default: %(default)s)",
+    )
+    add_backend_arguments(parser, backend=False)
+    add_cache_arguments(parser)
+    add_output_arguments(parser, exported="states")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # range to vector: "1:4" --> [1., 4.]
+    def r2v(a):
+        return [float(i) for i in a.split(":")] if a else None
+
+    try:
+        params = [float(p) for p in args.params.split(",")] if args.params else None
+        at = Attractor(
+            params,
+            r2v(args.x),
+            r2v(args.y),
+            args.n,
+            args.s,
+            args.map_name,
+            args.seeds,
+            args.chunk_size,
+        )
+    except (AssertionError, ValueError) as e:
+        die(2, str(e))
+
+    at.precision = args.precision
+    at.cache = None if args.nocache else Cache(args.cachedir)
+    at.density = args.density
+
+    # bin the states at the resolution of the plot by default
+    dpi = args.dpi if args.output else matplotlib.rcParams["figure.dpi"]
+    width, height = matplotlib.rcParams["figure.figsize"]
+    at.fit(width * dpi, height * dpi)
+    at.columns = args.columns or at.columns
+    at.rows = args.rows or at.rows
+
+    if args.profile:
+        at.profiler = Profiler()
+
+    if args.export:
+        try:
+            at.export(args.export)
+        except (ImportError, ValueError) as e:
+            die(2, str(e))
+
+    if args.output:
+        # render the plot without any GUI
+        matplotlib.use("Agg")
+        at.save(args.output, args.dpi)
+    elif not args.export:
+        at.plot()
+
+    if args.profile:
+        at.profiler.write(args.profile)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        die(3, "Exiting on user request")
+
+    sys.exit()
@@ -0,0 +1,256 @@
+#!/usr/bin/python3
+
+# Benchmarks for the Logistic Equation Library
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import lelib
+from lelib import (
+    BACKENDS,
+    PRECISIONS,
+    Bifurcation,
+    FinalState,
+    Logistic,
+    LogisticDiff,
+    Map,
+)
+from utils import argparser, die
+
+# size: (orbit length, bifurcation columns, bifurcation n, bifurcation s)
+SIZES = {
+    "tiny": (100, 10, 5, 5),
+    "small": (10000, 100, 50, 50),
+    "medium": (100000, 1000, 50, 50),
+    "large": (1000000, 1000, 500, 500),
+    "poster": (10000000, 10000, 500, 500),
+}
+
+# growth rates in the chaotic region of the maps
+RATES = {"logistic": 3.9, "cubic": 6.3, "sine": 1.9}
+
+
+def parse_args():
+    """This function parses and return arguments passed in"""
+    descr = "Benchmarks for the Logistic Equation Library"
+    examples = """
+      %(prog)s
+      %(prog)s --sizes tiny,small,medium,large -o bench.json
+      %(prog)s --backend numpy --compare bench.json"""
+
+    parser = argparser(descr, examples)
+
+    parser.add_argument(
+        "--sizes",
+        action="store",
+        dest="sizes",
+        default="tiny,small,medium",
+        help="comma separated list of sizes among: %s (default: %%(default)s)"
+        % ", ".join(SIZES),
+    )
+    parser.add_argument(
+        "--repeat",
+        action="store",
+        dest="repeat",
+        type=int,
+        default=3,
+        help="number of timed runs of each benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--backend",
+        action="store",
+        dest="backend",
+        default="auto",
+        choices=BACKENDS,
+        help="select the backend used for iterating the maps (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--precision",
+        action="store",
+        dest="precision",
+        default="float64",
+        choices=PRECISIONS,
+        help="select the floating point type of the orbits (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        action="store",
+        dest="output",
+        help="write the results to a JSON file",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store",
+        dest="compare",
+        help="compare the results with the ones stored in a JSON file",
+    )
+    parser.add_argument(
+        "--tolerance",
+        action="store",
+        dest="tolerance",
+        type=float,
+        default=0.2,
+        help="accepted relative slowdown with respect to --compare "
+        "(default: %(default)s)",
+    )
+
+    return parser.parse_args()
+
+
+def workloads(mapname, size, backend, precision="float64"):
+    """Yield the tuples (name, iterations, function) of the benchmarks"""
+
+    n, columns, bn, bs = SIZES[size]
+    r = RATES[mapname]
+
+    def setup(obj):
+        obj.backend = backend
+        obj.precision = precision
+        return obj
+
+    def run_map():
+        m = Map(mapname)
+        x = 0.5
+        for _ in range(n):
+            x = m.map(r, x)
+
+    def run_bifurcation():
+        bd = setup(Bifurcation([r - 0.5, r], [0, 1], bn, bs, mapname))
+        bd.columns = columns
+        bd.getxy()
+
+    yield "Map.map", n, run_map
+    yield "Logistic.getxy", n, lambda: setup(Logistic(r, n, 0.5, 0, mapname)).getxy()
+    yield "LogisticDiff.getxy", 2 * n, lambda: setup(
+        LogisticDiff(r, n, 0.5, 0.5001, 0, mapname)
+    ).getxy()
+    yield "FinalState.getxy", n, lambda: setup(
+        FinalState(r, n // 3, 0.5, n - n // 3, mapname)
+    ).getxy()
+    yield "Bifurcation.getxy", columns * (bn + bs), run_bifurcation
+
+
+def measure(function, repeat):
+    """Return the best wall time of 'repeat' runs of 'function' and the peak
+    memory allocated by a further (traced) run"""
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return seconds, peak
+
+
+def compare(results, filename, tolerance):
+    """Print the benchmarks slower than the ones stored in 'filename'
+    and return their number"""
+
+    with open(filename) as f:
+        baseline = dict(
+            ((b["workload"], b["map"], b["size"]), b) for b in json.load(f)["results"]
+        )
+
+    regressions = 0
+    for result in results:
+        key = (result["workload"], result["map"], result["size"])
+        if key not in baseline:
+            continue
+
+        ratio = baseline[key]["iterations_per_second"] / result["iterations_per_second"]
+        if ratio > 1.0 + tolerance:
+            regressions += 1
+            print("REGRESSION: %s (%s, %s) is %.2fx slower" % (key + (ratio,)))
+
+    return regressions
+
+
+def main():
+    args = parse_args()
+
+    sizes = args.sizes.split(",")
+    for size in sizes:
+        if size not in SIZES:
+            die(2, "unknown benchmark size: " + size)
+
+    # compile the JIT kernels (if any) before timing them
+    for mapname in RATES:
+        for _, _, function in workloads(mapname, "tiny", args.backend, args.precision):
+            function()
+
+    results = []
+    print(
+        "%-20s %-9s %-7s %14s %12s %12s"
+        % ("workload", "map", "size", "iterations", "it/s", "peak (kB)")
+    )
+    for size in sizes:
+        for mapname in RATES:
+            for name, iterations, function in workloads(
+                mapname, size, args.backend, args.precision
+            ):
+                seconds, peak = measure(function, args.repeat)
+                results.append(
+                    {
+                        "workload": name,
+                        "map": mapname,
+                        "size": size,
+                        "iterations": iterations,
+                        "seconds": seconds,
+                        "iterations_per_second": iterations / seconds,
+                        "peak_memory": peak,
+                    }
+                )
+                print(
+                    "%-20s %-9s %-7s %14d %12.4g %12d"
+                    % (
+                        name,
+                        mapname,
+                        size,
+                        iterations,
+                        iterations / seconds,
+                        peak // 1024,
+                    )
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "version": lelib.__version__,
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "backend": args.backend,
+                    "precision": args.precision,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        die(3, "Exiting on user request")
+
+    sys.exit()
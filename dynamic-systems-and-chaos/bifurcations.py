@@ -6,8 +6,19 @@
 
 import sys
 
-from lelib import Bifurcation, Map
-from utils import argparser, die
+import matplotlib
+
+from lecache import Cache
+from lelib import Bifurcation, BifurcationExplorer, Map
+from leprofile import Profiler
+from utils import (
+    add_backend_arguments,
+    add_cache_arguments,
+    add_map_argument,
+    add_output_arguments,
+    argparser,
+    die,
+)
 
 
 def parse_args():
@@ -18,7 +29,13 @@ def parse_args():
       %(prog)s -r 4:6.5 --map=cubic
       %(prog)s --map=sine -s 200 -n 200
       %(prog)s -r 3.:4. -s 500 -n 600
-      %(prog)s -r 3.5:3.6 -y .3:.6 -s 800 -n 1000"""
+      %(prog)s -r 3.5:3.6 -y .3:.6 -s 800 -n 1000
+      %(prog)s -r 2.8:4 -s 500 -n 2000 --density=log
+      %(prog)s -r 3.4:4 -s 500 -n 500 --lyapunov
+      %(prog)s -s 1000 -n 500 --explore
+      %(prog)s -r 2.8:4 -s 500 -n 500 -c 1000 --export=bifurcation.h5
+      %(prog)s -r 2.8:4 --dpi 300 --output=bifurcation.png
+      %(prog)s -r 2.8:4 --columns 4000 --samples-per-column 2000"""
 
     parser = argparser(descr, examples)
 
@@ -51,21 +68,80 @@ def parse_args():
     parser.add_argument(
         "-n",
         "--steps",
+        "--samples-per-column",
         action="store",
         dest="n",
         type=int,
-        default=100,
-        help="number of iterations (default: %(default)s)",
+        help="number of iterations (default: the pixel height of the plot)",
     )
     parser.add_argument(
-        "-m",
-        "--map",
+        "--columns",
         action="store",
-        dest="map_name",
-        default="logistic",
-        choices=["logistic", "cubic", "sine"],
-        help="select the desired map (logistic, cubic, or sine)",
+        dest="columns",
+        type=int,
+        help="number of growth rates (default: the pixel width of the plot)",
+    )
+    add_map_argument(parser)
+    parser.add_argument(
+        "-d",
+        "--density",
+        action="store",
+        dest="density",
+        choices=["linear", "log"],
+        help="plot the density of the final states with a linear or log shading "
+        "(default: log with --chunk-size, a scatter plot otherwise)",
+    )
+    parser.add_argument(
+        "-a",
+        "--adaptive",
+        action="store_true",
+        dest="adaptive",
+        help="sample more r values where the diagram changes (default: %(default)s)",
     )
+    parser.add_argument(
+        "-l",
+        "--lyapunov",
+        action="store_true",
+        dest="lyapunov",
+        help="also plot the Lyapunov exponents (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-e",
+        "--explore",
+        action="store_true",
+        dest="explore",
+        help="recompute the visible window after each zoom or pan "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="number of worker processes, 0 for all the CPUs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        action="store",
+        dest="chunk_size",
+        type=int,
+        help="compute at most 'chunk_size' r values at once, keeping a chunk of "
+        "final states in memory, so the plot is a density raster (default: all)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        action="store",
+        dest="tol",
+        type=float,
+        help="stop iterating the orbits converged to a cycle within 'tol'",
+    )
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
 
     return parser.parse_args()
 
@@ -82,13 +158,64 @@ def main():
     )
 
     # Plot the entire diagram by default
-    Bifurcation(
+    bd = Bifurcation(
         r2v(args.r, mapobj.map_rmin, mapobj.map_rmax),
         r2v(args.y, mapobj.map_ymin, mapobj.map_ymax),
-        args.n,
+        args.n or 1,
         args.s,
         args.map_name,
-    ).plot()
+        args.jobs,
+        args.chunk_size,
+    )
+    bd.backend = args.backend
+    bd.precision = args.precision
+    bd.tol = args.tol
+    bd.adaptive = args.adaptive
+    bd.cache = None if args.nocache else Cache(args.cachedir)
+    # a scatter plot would keep all the final states in memory
+    bd.density = args.density or ("log" if args.chunk_size else None)
+    bd.plotlyapunov = args.lyapunov
+
+    # sample the diagram at the resolution of the plot by default
+    dpi = args.dpi if args.output else matplotlib.rcParams["figure.dpi"]
+    width, height = matplotlib.rcParams["figure.figsize"]
+    bd.fit(width * dpi, height * dpi)
+    bd.columns = args.columns or bd.columns
+    bd.n = args.n or bd.n
+
+    budget = bd.budget()
+    print(
+        "Computing %d columns x %d samples: %.3g map evaluations, "
+        "%.3g MB of final states%s"
+        % (
+            budget["columns"],
+            budget["samples"],
+            budget["evaluations"],
+            budget["bytes"] / 2.0**20,
+            " per chunk" if args.chunk_size else "",
+        )
+    )
+
+    if args.profile:
+        bd.profiler = Profiler()
+
+    if args.export:
+        try:
+            bd.export(args.export)
+        except (ImportError, ValueError) as e:
+            die(2, str(e))
+
+    if args.output:
+        # render the plot without any GUI
+        matplotlib.use("Agg")
+        bd.save(args.output, args.dpi)
+    elif args.explore:
+        BifurcationExplorer(bd).plot()
+    elif not args.export:
+        bd.plot()
+
+    if args.profile:
+        bd.profiler.write(args.profile)
 
 
 if __name__ == "__main__":
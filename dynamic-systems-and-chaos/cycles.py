@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+
+# Period Doublings and Periodic Windows of Logistic, Cubic, and Sine Maps
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import sys
+
+from leanalysis import Cycles
+from utils import add_map_argument, argparser, die
+
+
+def parse_args():
+    """This function parses and return arguments passed in"""
+    descr = "Period Doublings and Periodic Windows of Logistic, Cubic, and Sine Maps"
+    examples = """
+      %(prog)s
+      %(prog)s --map=cubic -d 10
+      %(prog)s -w 3:3.83 -w 5:3.74
+      %(prog)s --map=sine -d 4 -w 3:1.88"""
+
+    parser = argparser(descr, examples)
+
+    # By default, compute the first 8 period doublings of the Logistic Equation
+
+    parser.add_argument(
+        "-d",
+        "--doublings",
+        action="store",
+        dest="doublings",
+        type=int,
+        default=8,
+        help="number of period doublings of the cascade (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--window",
+        action="append",
+        dest="windows",
+        default=[],
+        metavar="K:R",
+        help="locate the periodic window of period K nearest to the growth "
+        "rate R (the option can be repeated)",
+    )
+    add_map_argument(parser)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cycles = Cycles(args.map_name)
+
+    try:
+        windows = [(int(k), float(r)) for k, r in (w.split(":") for w in args.windows)]
+    except ValueError:
+        die(2, "the periodic windows must be given as K:R, for instance 3:3.83")
+
+    try:
+        if args.doublings > 0:
+            doublings, superstable = cycles.cascade(args.doublings)
+            delta = Cycles.feigenbaum(doublings)
+
+            print("Period doublings of the %s map:" % args.map_name)
+            for n, rate in enumerate(doublings):
+                print(
+                    "period %5d: superstable at r=%.16g, doubles at r=%.16g%s"
+                    % (
+                        2**n,
+                        superstable[n],
+                        rate,
+                        ", delta=%.10f" % delta[n - 2] if n >= 2 else "",
+                    )
+                )
+
+        for k, r in windows:
+            print(
+                "period-%d window: opens at r=%.16g, superstable at r=%.16g, "
+                "doubles at r=%.16g" % ((k,) + cycles.window(k, r))
+            )
+    except AssertionError as e:
+        die(1, str(e))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        die(3, "Exiting on user request")
+
+    sys.exit()
@@ -6,8 +6,19 @@
 
 import sys
 
+import matplotlib
+
+from lecache import Cache
 from lelib import FinalState
-from utils import argparser, die
+from leprofile import Profiler
+from utils import (
+    add_backend_arguments,
+    add_cache_arguments,
+    add_map_argument,
+    add_output_arguments,
+    argparser,
+    die,
+)
 
 
 def parse_args():
@@ -17,7 +28,9 @@ def parse_args():
       %(prog)s -r 3.492
       %(prog)s -r 3.614 -s 200 -n 300
       %(prog)s -0 0.4 -r 3.2 -s 10 -n 50
-      %(prog)s -0 0.8 -r 6.2 -n 20 --map=cubic"""
+      %(prog)s -0 0.8 -r 6.2 -n 20 --map=cubic
+      %(prog)s -r 3.5 --tolerance 1e-10
+      %(prog)s -r 3.7 --export=finalstate.parquet"""
 
     parser = argparser(descr, examples)
 
@@ -61,15 +74,18 @@ def parse_args():
         action="store",
         help="number of iterations (default: %(default)s)",
     )
+    add_map_argument(parser)
     parser.add_argument(
-        "-m",
-        "--map",
+        "-t",
+        "--tolerance",
         action="store",
-        dest="map_name",
-        default="logistic",
-        choices=["logistic", "cubic", "sine"],
-        help="select the desired map (logistic, cubic, or sine)",
+        dest="tol",
+        type=float,
+        help="stop iterating the orbits converged to a cycle within 'tol'",
     )
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
 
     return parser.parse_args()
 
@@ -77,7 +93,29 @@ def parse_args():
 def main():
     args = parse_args()
 
-    FinalState(args.r, args.n, args.x0, args.s, args.map_name).plot()
+    fs = FinalState(args.r, args.n, args.x0, args.s, args.map_name, args.tol)
+    fs.backend = args.backend
+    fs.precision = args.precision
+    fs.cache = None if args.nocache else Cache(args.cachedir)
+
+    if args.profile:
+        fs.profiler = Profiler()
+
+    if args.export:
+        try:
+            fs.export(args.export)
+        except (ImportError, ValueError) as e:
+            die(2, str(e))
+
+    if args.output:
+        # render the plot without any GUI
+        matplotlib.use("Agg")
+        fs.save(args.output, args.dpi)
+    elif not args.export:
+        fs.plot()
+
+    if args.profile:
+        fs.profiler.write(args.profile)
 
 
 if __name__ == "__main__":
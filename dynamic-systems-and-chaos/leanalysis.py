@@ -0,0 +1,327 @@
+#!/usr/bin/python3
+
+# Periodic cycles and bifurcation points of the Logistic Equation Library
+# Copyright (C) 2016-2018 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Davide Madrisan"
+__copyright__ = "Copyright (C) 2016-2018 Davide Madrisan"
+__license__ = "Apache License 2.0"
+__version__ = "1"
+__email__ = "davide.madrisan@gmail.com"
+__status__ = "stable"
+
+import numpy as np
+
+from lelib import Map
+
+# The machine epsilon of the double precision floating point numbers
+EPS = np.finfo(float).eps
+
+
+class Cycles(object):
+    """Finder of the periodic cycles of a map and of the growth rates where
+    they change stability, by root-finding instead of iterating the orbits:
+
+        - cycle(r, k) solves f^k(x) = x by Newton's method;
+        - superstable(k, r) solves f^k(c) = c, where c is the critical point
+          of the map, by the secant method;
+        - boundary(k, r) follows the k-cycle along r until its multiplier
+          (f^k)'(x) reaches -1 (period doubling) or +1 (saddle-node), and
+          solves f^k(x) = x, (f^k)'(x) = +/-1 by Newton's method in (x, r).
+
+    The computations are done in double precision, and the results are
+    accurate to a few units in the last place. Usage:
+
+        cycles = Cycles("logistic")
+        doublings, superstable = cycles.cascade(10)
+        print(Cycles.feigenbaum(superstable))"""
+
+    def __init__(self, mapname="logistic", maxiter=100):
+        self.map = Map(mapname)
+        self.maxiter = maxiter  # Maximum number of iterations of the solvers
+
+    def _compose(self, r, x, k):
+        """Return f^k(x), its derivative with respect to x (the multiplier
+        of the cycle when x is one of its points), and with respect to r"""
+
+        f, derivative = self.map.map_function, self.map.map_derivative
+        h = 1e-6 * max(1.0, abs(r))
+        mu, dr = 1.0, 0.0
+        for _ in range(k):
+            # chain rule: d/dr f(r, x(r)) = df/dr + f'(x) dx/dr
+            fprime = float(derivative(r, x))
+            dr = float(f(r + h, x) - f(r - h, x)) / (2 * h) + fprime * dr
+            mu *= fprime
+            x = float(f(r, x))
+
+        return x, mu, dr
+
+    def _multiplier(self, r, x, k):
+        mu = 1.0
+        for _ in range(k):
+            mu *= float(self.map.map_derivative(r, x))
+            x = float(self.map.map_function(r, x))
+        return mu
+
+    def _converged(self, step, previous, value):
+        """Return whether the iterations have converged: when the steps are
+        down to the last digits of 'value', or they stop decreasing because
+        of the rounding errors of f^k, which grow with k"""
+
+        scale = max(1.0, abs(value))
+        return abs(step) <= 4 * EPS * scale or (
+            abs(step) >= abs(previous) and abs(step) <= 1e-9 * scale
+        )
+
+    def critical(self, r):
+        """Return the critical point of the map (the maximum of f) for the
+        growth rate r, where f'(x) = 0, by bisection"""
+
+        x = np.linspace(self.map.map_ymin, self.map.map_ymax, 1001)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fprime = self.map.map_derivative(r, x)
+        # the derivative may vanish on a point of the grid
+        changes = np.nonzero(
+            (fprime[:-1] != 0) & (np.sign(fprime[:-1]) != np.sign(fprime[1:]))
+        )[0]
+        self.map.ensure(changes.size > 0, "The map has no critical point")
+        i = changes[np.argmax(self.map.map_function(r, x[changes]))]
+
+        low, high = x[i], x[i + 1]
+        if fprime[i + 1] == 0:
+            return high
+
+        sign = np.sign(fprime[i])
+        while high - low > 2 * EPS * max(1.0, abs(low)):
+            middle = (low + high) / 2.0
+            side = np.sign(self.map.map_derivative(r, middle))
+            if side == 0:
+                return middle
+            elif side == sign:
+                low = middle
+            else:
+                high = middle
+
+        return (low + high) / 2.0
+
+    def period(self, r, x, k, tol=1e-9):
+        """Return the smallest period of the k-cycle through x"""
+
+        for p in range(1, k + 1):
+            if k % p == 0 and abs(self._compose(r, x, p)[0] - x) <= tol * max(
+                1.0, abs(x)
+            ):
+                return p
+        return k
+
+    def _solvecycle(self, r, x, k):
+        """Return the point of the k-cycle found by Newton's method starting
+        from x, or None if it does not converge in the range of the map"""
+
+        span = self.map.map_ymax - self.map.map_ymin
+        step = np.inf
+        for _ in range(self.maxiter):
+            fx, mu = self._compose(r, x, k)[:2]
+            if mu == 1.0:
+                return None
+            step, previous = (fx - x) / (mu - 1.0), step
+            x -= step
+            if not abs(x - self.map.map_ymin) <= 2 * span:
+                return None
+            if self._converged(step, previous, x):
+                return x
+
+        return None
+
+    def cycle(self, r, k, x0=None):
+        """Return the k points of the cycle of period k found by Newton's
+        method starting from x0 (by default, from the state reached by
+        iterating the critical point) and its multiplier (f^k)'(x)"""
+
+        self.map._check_rate(r)
+        self.map.ensure(k > 0, "The period must be greater than zero.")
+
+        if x0 is None:
+            x0 = self.critical(r)
+            for _ in range(1000 * k):
+                x0 = float(self.map.map_function(r, x0))
+
+        x = self._solvecycle(r, x0, k)
+        self.map.ensure(x is not None, "No cycle of period %d found at r=%r", k, r)
+
+        points = [x]
+        for _ in range(k - 1):
+            points.append(float(self.map.map_function(r, points[-1])))
+
+        return np.array(points), self._multiplier(r, x, k)
+
+    def superstable(self, k, r0):
+        """Return the growth rate near r0 of the superstable cycle of period
+        k (through the critical point c, having multiplier 0) solving
+        f^k(c) = c by the secant method"""
+
+        self.map._check_rate(r0)
+
+        def g(r):
+            c = self.critical(r)
+            return self._compose(r, c, k)[0] - c
+
+        r0, r1 = r0 * (1 + 1e-6) if r0 else 1e-6, r0
+        g0, g1 = g(r0), g(r1)
+        step = np.inf
+        for _ in range(self.maxiter):
+            if g1 == 0 or g1 == g0:
+                break
+            previous = step
+            r0, r1 = r1, r1 - g1 * (r1 - r0) / (g1 - g0)
+            step = r1 - r0
+            self.map.ensure(
+                self.map.map_rmin <= r1 <= self.map.map_rmax,
+                "No superstable cycle of period %d found",
+                k,
+            )
+            if self._converged(step, previous, r1):
+                break
+            g0, g1 = g1, g(r1)
+
+        self.map.ensure(
+            self.period(r1, self.critical(r1), k) == k,
+            "No superstable cycle of period %d found",
+            k,
+        )
+        return r1
+
+    def boundary(self, k, r, x=None, multiplier=-1.0):
+        """Return the growth rate, and the point of the cycle, where the
+        k-cycle through x at r (by default, the superstable cycle through
+        the critical point) reaches the 'multiplier': -1 for the period
+        doubling (toward larger r in the cascades), +1 for the saddle-node
+        bifurcation where the cycle is born (toward smaller r)"""
+
+        self.map._check_rate(r)
+        if x is None:
+            x = self.critical(r)
+        x = self._solvecycle(r, x, k)
+        self.map.ensure(x is not None, "No cycle of period %d found at r=%r", k, r)
+        mu = self._multiplier(r, x, k)
+
+        # a first step to the multiplier from the slope of the multiplier,
+        # the cycles of period 2^n being stable on intervals of r about
+        # 4.67^-n wide
+        h = 1e-10 * max(1.0, abs(r))
+        around = [self._solvecycle(r + d, x, k) for d in (-h, h)]
+        self.map.ensure(None not in around, "The %d-cycle cannot be followed", k)
+        slope = (
+            self._multiplier(r + h, around[1], k)
+            - self._multiplier(r - h, around[0], k)
+        ) / (2 * h)
+        self.map.ensure(slope != 0, "The multiplier of the %d-cycle is constant", k)
+        step = first = (multiplier - mu) / slope
+        span = self.map.map_ymax - self.map.map_ymin
+
+        # follow the cycle along r, doubling the step while the multiplier
+        # is not reached and halving it when the cycle crosses the
+        # multiplier or disappears, until close to the bifurcation
+        for _ in range(self.maxiter):
+            if abs(step) <= abs(first) / 4096.0:
+                break
+            rnext = r + step
+            xnext = None
+            if self.map.map_rmin <= rnext <= self.map.map_rmax:
+                xnext = self._solvecycle(rnext, x, k)
+            # f^k(x) = x is also solved by the cycles of period dividing k
+            if (
+                xnext is not None
+                and abs(xnext - x) <= 0.1 * span
+                and self.period(rnext, xnext, k) == k
+            ):
+                munext = self._multiplier(rnext, xnext, k)
+                if (munext - multiplier) * (mu - multiplier) > 0:
+                    r, x, mu = rnext, xnext, munext
+                    step *= 2.0
+                    continue
+            step /= 2.0
+        else:
+            self.map.ensure(False, "The %d-cycle cannot be followed", k)
+
+        rbound, xbound = self._solveboundary(r, x, k, multiplier)
+        self.map.ensure(
+            abs(rbound - r) <= 4 * abs(step),
+            "The bifurcation of the %d-cycle cannot be located",
+            k,
+        )
+        return rbound, xbound
+
+    def _solveboundary(self, r, x, k, multiplier):
+        """Solve f^k(x) = x and (f^k)'(x) = multiplier by Newton's method in
+        (x, r), with the derivatives of the multiplier by central differences"""
+
+        steps = (np.inf, np.inf)
+        for _ in range(self.maxiter):
+            fx, mu, dr = self._compose(r, x, k)
+            hx = 1e-7 * max(1.0, abs(x))
+            hr = 1e-10 * max(1.0, abs(r))
+            jacobian = [
+                [mu - 1.0, dr],
+                [
+                    (self._multiplier(r, x + hx, k) - self._multiplier(r, x - hx, k))
+                    / (2 * hx),
+                    (self._multiplier(r + hr, x, k) - self._multiplier(r - hr, x, k))
+                    / (2 * hr),
+                ],
+            ]
+            try:
+                dx, dr = np.linalg.solve(jacobian, [x - fx, multiplier - mu])
+            except np.linalg.LinAlgError:
+                # not a saddle-node (a transcritical bifurcation, say)
+                break
+            x, r = x + dx, r + dr
+            if self._converged(dx, steps[0], x) and self._converged(dr, steps[1], r):
+                return r, x
+            steps = (dx, dr)
+
+        self.map.ensure(False, "The bifurcation of the %d-cycle does not converge", k)
+
+    def window(self, k, r0):
+        """Return the growth rates where the periodic window of period k
+        near r0 opens (saddle-node bifurcation), where its cycle is
+        superstable, and where it doubles its period"""
+
+        r = self.superstable(k, r0)
+        return (
+            self.boundary(k, r, multiplier=1.0)[0],
+            r,
+            self.boundary(k, r, multiplier=-1.0)[0],
+        )
+
+    def cascade(self, count):
+        """Return the growth rates of the first 'count' period doublings
+        (where the cycles of period 1, 2, 4, ... lose their stability) and
+        of the count+1 superstable cycles of period 1, 2, 4, ... The first
+        superstable cycle is looked for from the centre of the r range,
+        each following one just after the period doubling preceding it"""
+
+        self.map.ensure(count > 0, "The number of doublings must be positive.")
+
+        superstable = [
+            self.superstable(1, (self.map.map_rmin + self.map.map_rmax) / 2.0)
+        ]
+        doublings = []
+        for n in range(count):
+            doublings.append(self.boundary(2**n, superstable[-1])[0])
+            # the superstable cycle is at about 1/4 of the distance between
+            # the previous superstable cycle and the period doubling
+            guess = doublings[-1] + 0.25 * (doublings[-1] - superstable[-1])
+            superstable.append(self.superstable(2 ** (n + 1), guess))
+
+        return np.array(doublings), np.array(superstable)
+
+    @staticmethod
+    def feigenbaum(rates):
+        """Return the estimates (r[n] - r[n-1]) / (r[n+1] - r[n]) of the
+        Feigenbaum constant 4.669201... from the growth rates of a cascade
+        of period doublings (or of superstable cycles)"""
+
+        gaps = np.diff(rates)
+        return gaps[:-1] / gaps[1:]
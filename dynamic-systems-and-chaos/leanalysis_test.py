@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+
+# Periodic cycles and bifurcation points - Unit tests
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import print_function
+from math import sqrt
+
+import numpy as np
+
+from leanalysis import Cycles
+from lelib import Map
+
+FEIGENBAUM_DELTA = 4.669201609102990
+
+
+def _attractor_period(mapname, r, s=20000, maxperiod=64):
+    """Return the period of the attractor reached by iterating the map"""
+
+    mapobj = Map(mapname)
+    x = 0.3
+    for _ in range(s):
+        x = mapobj.map_function(r, x)
+    orbit = [x]
+    for _ in range(maxperiod):
+        orbit.append(mapobj.map_function(r, orbit[-1]))
+    for period in range(1, maxperiod + 1):
+        if abs(orbit[period] - orbit[0]) < 1e-7:
+            return period
+    return None
+
+
+def test_cycles_cycle():
+    """Test the cycles found by Newton's method"""
+
+    print("Running the tests for the method 'Cycles.cycle'...")
+
+    r = 3.2
+    points, multiplier = Cycles("logistic").cycle(r, 2)
+    expected = (r + 1 + np.array([-1, 1]) * sqrt((r + 1) * (r - 3))) / (2 * r)
+    Map.ensure(
+        np.allclose(np.sort(points), expected, rtol=0, atol=1e-15),
+        "Bad points of the 2-cycle: %s",
+        points,
+    )
+    Map.ensure(
+        abs(multiplier - (4 + 2 * r - r * r)) < 1e-13,
+        "Bad multiplier of the 2-cycle: %r",
+        multiplier,
+    )
+
+    try:
+        Cycles("logistic").cycle(4.5, 1)
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("A growth rate out of range should be rejected")
+
+
+def test_cycles_cascade():
+    """Test the period doublings and the superstable cycles of the cascades"""
+
+    print("Running the tests for the method 'Cycles.cascade'...")
+
+    doublings, superstable = Cycles("logistic").cascade(8)
+    for computed, expected in (
+        (doublings[0], 3.0),
+        (doublings[1], 1 + sqrt(6)),
+        (doublings[2], 3.5440903595519228),
+        (superstable[0], 2.0),
+        (superstable[1], 1 + sqrt(5)),
+        (superstable[2], 3.4985616993277016),
+    ):
+        Map.ensure(
+            abs(computed - expected) < 1e-14,
+            "Bad bifurcation point: %r instead of %r",
+            computed,
+            expected,
+        )
+
+    for mapname in ("logistic", "cubic", "sine"):
+        doublings, superstable = Cycles(mapname).cascade(8)
+        for rates in (doublings, superstable):
+            delta = Cycles.feigenbaum(rates)[-1]
+            Map.ensure(
+                abs(delta - FEIGENBAUM_DELTA) < 1e-3,
+                "Bad estimate of the Feigenbaum constant for the %s map: %r",
+                mapname,
+                delta,
+            )
+
+        # the iterated orbits double their period at the computed rates
+        for n in (1, 2):
+            gap = doublings[n] - doublings[n - 1]
+            for r, period in (
+                (doublings[n] - gap / 10, 2**n),
+                (doublings[n] + gap / 10, 2 ** (n + 1)),
+            ):
+                Map.ensure(
+                    _attractor_period(mapname, r) == period,
+                    "The %s map should have a %d-cycle at r=%r",
+                    mapname,
+                    period,
+                    r,
+                )
+
+
+def test_cycles_window():
+    """Test the periodic windows"""
+
+    print("Running the tests for the method 'Cycles.window'...")
+
+    opens, superstable, doubles = Cycles("logistic").window(3, 3.83)
+    Map.ensure(
+        abs(opens - (1 + sqrt(8))) < 1e-14,
+        "The period-3 window should open at 1+sqrt(8), not %r",
+        opens,
+    )
+    Map.ensure(
+        abs(superstable - 3.8318740552833155) < 1e-14,
+        "Bad superstable 3-cycle at r=%r",
+        superstable,
+    )
+    Map.ensure(
+        opens < superstable < doubles,
+        "Bad period-3 window: %r, %r, %r",
+        opens,
+        superstable,
+        doubles,
+    )
+
+    # the non-trivial fixed point of the cubic map is born at r=4, and
+    # loses its stability where r x (2 - 3x) = -1, that is at r=16/3
+    window = Cycles("cubic").window(1, 4.4)
+    Map.ensure(
+        np.allclose(window, [4, 4.5, 16 / 3.0], rtol=0, atol=1e-14),
+        "Bad window of the fixed point of the cubic map: %s",
+        window,
+    )
+
+
+def tests():
+    test_cycles_cycle()
+    test_cycles_cascade()
+    test_cycles_window()
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+
+# Persistent on-disk cache for the Logistic Equation Library
+# Copyright (C) 2016-2018 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Davide Madrisan"
+__copyright__ = "Copyright (C) 2016-2018 Davide Madrisan"
+__license__ = "Apache License 2.0"
+__version__ = "1"
+__email__ = "davide.madrisan@gmail.com"
+__status__ = "stable"
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+def default_cachedir():
+    """Return the default cache directory (honouring $XDG_CACHE_HOME)"""
+
+    return os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+        "dynamic-systems-and-chaos",
+    )
+
+
+class Cache(object):
+    """Content-addressed cache storing numpy arrays as .npy files, which are
+    memory-mapped when loaded back. When the total size of the cache exceeds
+    'maxsize' bytes, the least recently used files are evicted"""
+
+    def __init__(self, cachedir=None, maxsize=1 << 30):
+        self.cachedir = cachedir or default_cachedir()
+        self.maxsize = maxsize
+        self._size = None  # The estimated size of the cache, None if unknown
+
+        if not os.path.isdir(self.cachedir):
+            os.makedirs(self.cachedir)
+
+    @staticmethod
+    def _jsonify(value):
+        """Convert the numpy arrays to a (dtype, shape, digest) description"""
+
+        if isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value)
+            return [
+                str(value.dtype),
+                list(value.shape),
+                hashlib.sha256(value.tobytes()).hexdigest(),
+            ]
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError("Cannot build a cache key from %r" % (value,))
+
+    def key(self, **params):
+        """Return the key identifying the computation described by 'params'"""
+
+        text = json.dumps(params, sort_keys=True, default=self._jsonify)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cachedir, key + ".npy")
+
+    def get(self, key):
+        """Return the (read-only, memory-mapped) array stored with 'key',
+        or None if it is not in the cache"""
+
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path, None)  # mark the entry as recently used
+        except (IOError, OSError, ValueError):
+            return None
+
+        return array
+
+    def put(self, key, array):
+        """Store 'array' with 'key' and evict the old entries if needed: the
+        cache directory is only scanned when the running estimate of its
+        size (exact after each scan) exceeds 'maxsize'"""
+
+        fd, tmppath = tempfile.mkstemp(dir=self.cachedir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+                filesize = f.tell()
+            os.rename(tmppath, self._path(key))
+        except BaseException:
+            os.remove(tmppath)
+            raise
+
+        if self._size is not None:
+            self._size += filesize
+        if self._size is None or self._size > self.maxsize:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the size of the
+        cache is not greater than 'maxsize'"""
+
+        entries = []
+        for name in os.listdir(self.cachedir):
+            if name.endswith(".npy"):
+                # the entry may be evicted meanwhile by another process
+                try:
+                    st = os.stat(os.path.join(self.cachedir, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+
+        size = sum(entry[1] for entry in entries)
+        for _, filesize, name in sorted(entries):
+            if size <= self.maxsize:
+                break
+            try:
+                os.remove(os.path.join(self.cachedir, name))
+            except OSError:
+                continue
+            size -= filesize
+
+        self._size = size
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+
+# Persistent on-disk cache - Unit tests
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from lecache import Cache
+from lelib import Map, Bifurcation
+
+
+def test_class_cache():
+    """Test the class 'Cache'"""
+
+    print("Running the tests for the class 'Cache'...")
+
+    cachedir = tempfile.mkdtemp()
+    try:
+        cache = Cache(cachedir, maxsize=2000)
+        r = np.linspace(3, 4, 100)
+
+        key = cache.key(map="logistic", r=r, n=10)
+        Map.ensure(
+            key == cache.key(n=10, r=r.copy(), map="logistic"),
+            "The cache key should only depend on the content of the parameters",
+        )
+        Map.ensure(
+            key != cache.key(map="logistic", r=r[:-1], n=10),
+            "Different parameters should give different cache keys",
+        )
+        Map.ensure(cache.get(key) is None, "The cache should be empty")
+
+        cache.put(key, r)
+        cached = cache.get(key)
+        Map.ensure(isinstance(cached, np.memmap), "The array should be mmapped")
+        Map.ensure(np.array_equal(cached, r), "Bad array returned by the cache")
+
+        # 100 floats take ~1kB, so only the two most recent arrays fit
+        os.utime(os.path.join(cachedir, key + ".npy"), (0, 0))
+        cache.put("a", r)
+        cache.put("b", r)
+        Map.ensure(cache.get(key) is None, "The LRU entry should be evicted")
+        Map.ensure(cache.get("a") is not None, "The entry 'a' should be cached")
+        Map.ensure(cache.get("b") is not None, "The entry 'b' should be cached")
+
+        # the entries vanishing while the cache is scanned are skipped
+        os.symlink(os.path.join(cachedir, "missing"), os.path.join(cachedir, "c.npy"))
+        cache.evict()
+        Map.ensure(cache.get("b") is not None, "The entry 'b' should be kept")
+        os.remove(os.path.join(cachedir, "c.npy"))
+
+        bd = Bifurcation([3, 4], [0, 1], 20, 20)
+        bd.cache = cache
+        cache.maxsize = 1 << 20
+        _, states = bd.getxy()
+        _, cached = bd.getxy()
+        Map.ensure(isinstance(cached, np.memmap), "The states should be cached")
+        Map.ensure(np.array_equal(cached, states), "Bad states returned by the cache")
+    finally:
+        shutil.rmtree(cachedir)
+
+
+def tests():
+    test_class_cache()
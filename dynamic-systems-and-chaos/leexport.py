@@ -0,0 +1,205 @@
+#!/usr/bin/python3
+
+# Export of the computed arrays for the Logistic Equation Library
+# Copyright (C) 2016-2018 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Davide Madrisan"
+__copyright__ = "Copyright (C) 2016-2018 Davide Madrisan"
+__license__ = "Apache License 2.0"
+__version__ = "1"
+__email__ = "davide.madrisan@gmail.com"
+__status__ = "stable"
+
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+# The supported file formats, selected by the extension of the file name.
+# HDF5 requires the optional module h5py and Parquet the module pyarrow
+FORMATS = {".npz": "npz", ".h5": "hdf5", ".hdf5": "hdf5", ".parquet": "parquet"}
+
+
+def _jsonify(value):
+    """Convert the numpy values found in the run parameters"""
+
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError("Cannot export the parameter %r" % (value,))
+
+
+class _NpzWriter(object):
+    """Writer of .npz files: the chunks of each array are spooled to a
+    temporary file and copied at the end in a .npy member of the archive,
+    whose header must contain the final shape"""
+
+    def __init__(self, filename, params):
+        self.filename = filename
+        self.params = params
+        self.parts = {}
+
+    def write(self, name, array):
+        if name not in self.parts:
+            self.parts[name] = [tempfile.TemporaryFile(), array.dtype, array.shape, 0]
+
+        part = self.parts[name]
+        part[0].write(array.tobytes())
+        part[3] += array.shape[0]
+
+    def close(self):
+        with zipfile.ZipFile(self.filename, "w", allowZip64=True) as archive:
+            with archive.open("params.npy", "w") as f:
+                np.lib.format.write_array(f, np.array(self.params))
+
+            for name, (spool, dtype, shape, rows) in self.parts.items():
+                header = {
+                    "descr": np.lib.format.dtype_to_descr(dtype),
+                    "fortran_order": False,
+                    "shape": (rows,) + shape[1:],
+                }
+                with archive.open(name + ".npy", "w", force_zip64=True) as f:
+                    np.lib.format.write_array_header_2_0(f, header)
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, f)
+                spool.close()
+
+
+class _Hdf5Writer(object):
+    """Writer of HDF5 files: each array is a dataset resized at each chunk"""
+
+    def __init__(self, filename, params):
+        import h5py
+
+        self.file = h5py.File(filename, "w")
+        self.file.attrs["params"] = params
+
+    def write(self, name, array):
+        if name not in self.file:
+            self.file.create_dataset(
+                name, data=array, maxshape=(None,) + array.shape[1:], chunks=True
+            )
+            return
+
+        dataset = self.file[name]
+        rows = dataset.shape[0]
+        dataset.resize(rows + array.shape[0], axis=0)
+        dataset[rows:] = array
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter(object):
+    """Writer of Parquet files: each chunk is a row group, the arrays are
+    the columns of the table (as lists of fixed size when 2-dimensional)"""
+
+    def __init__(self, filename, params):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.filename = filename
+        self.params = params
+        self.writer = None
+        self.columns = {}
+
+    def _column(self, array):
+        if array.ndim == 1:
+            return self.pa.array(array)
+        return self.pa.FixedSizeListArray.from_arrays(
+            self.pa.array(array.reshape(-1)), array.shape[1]
+        )
+
+    def write(self, name, array):
+        self.columns[name] = self._column(array)
+
+    def flush(self):
+        table = self.pa.table(self.columns, metadata={"params": self.params})
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.filename, table.schema)
+        self.writer.write_table(table)
+        self.columns = {}
+
+    def close(self):
+        if self.writer is None:
+            self.pq.write_table(
+                self.pa.table({}, metadata={"params": self.params}), self.filename
+            )
+        else:
+            self.writer.close()
+
+
+class Exporter(object):
+    """Writer of the arrays computed by the Logistic Equation Library along
+    with their run parameters, in one of the FORMATS. The arrays are written
+    by chunks, appended along their first axis, so that a large dataset
+    never needs to be entirely kept in memory. Usage:
+
+        with Exporter("orbits.npz", {"map": "logistic"}) as exporter:
+            exporter.write(r=r1, states=states1)
+            exporter.write(r=r2, states=states2)
+
+    The run parameters are stored as a JSON string: in the array 'params' of
+    the .npz files, in the attribute 'params' of the HDF5 files, and in the
+    key 'params' of the metadata of the Parquet files"""
+
+    def __init__(self, filename, params):
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in FORMATS:
+            raise ValueError(
+                "Unsupported export format %r (use one of: %s)"
+                % (extension, ", ".join(FORMATS))
+            )
+        self.format = FORMATS[extension]
+
+        self.params = json.dumps(params, sort_keys=True, default=_jsonify)
+        self._shapes = {}
+
+        try:
+            self._writer = {
+                "npz": _NpzWriter,
+                "hdf5": _Hdf5Writer,
+                "parquet": _ParquetWriter,
+            }[self.format](filename, self.params)
+        except ImportError:
+            raise ImportError(
+                "The %s export requires the %s module"
+                % (self.format, "h5py" if self.format == "hdf5" else "pyarrow")
+            )
+
+    def write(self, **arrays):
+        """Append a chunk of each one of the named arrays"""
+
+        rows = None
+        for name, array in sorted(arrays.items()):
+            array = np.ascontiguousarray(array)
+            if array.ndim == 0:
+                array = array.reshape(1)
+
+            shape = (array.dtype, array.shape[1:])
+            if self._shapes.setdefault(name, shape) != shape:
+                raise ValueError("Inconsistent chunks of the array '%s'" % name)
+            if self.format == "parquet" and rows not in (None, array.shape[0]):
+                raise ValueError("The columns of a Parquet chunk must have one length")
+            rows = array.shape[0]
+
+            self._writer.write(name, array)
+
+        if self.format == "parquet":
+            self._writer.flush()
+
+    def close(self):
+        """Complete and close the file"""
+
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+
+# Export of the computed arrays - Unit tests
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import print_function
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from leexport import Exporter
+from lelib import Map, Bifurcation, FinalState, LogisticDiff
+
+
+def test_class_exporter():
+    """Test the class 'Exporter'"""
+
+    print("Running the tests for the class 'Exporter'...")
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmpdir, "chunks.npz")
+        with Exporter(filename, {"map": "logistic", "r": np.float64(3.5)}) as exp:
+            exp.write(r=np.arange(3.0), states=np.ones((3, 4)))
+            exp.write(r=np.arange(3.0, 5.0), states=np.zeros((2, 4)))
+
+        data = np.load(filename)
+        Map.ensure(
+            json.loads(str(data["params"])) == {"map": "logistic", "r": 3.5},
+            "Bad run parameters exported",
+        )
+        Map.ensure(np.array_equal(data["r"], np.arange(5.0)), "Bad chunks of 'r'")
+        Map.ensure(
+            np.array_equal(data["states"][:3], np.ones((3, 4)))
+            and np.array_equal(data["states"][3:], np.zeros((2, 4))),
+            "Bad chunks of 'states'",
+        )
+
+        exp = Exporter(filename, {})
+        exp.write(states=np.ones((3, 4)))
+        try:
+            exp.write(states=np.ones((3, 5)))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Inconsistent chunks should be rejected")
+        exp.close()
+
+        try:
+            Exporter(os.path.join(tmpdir, "data.csv"), {})
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Unknown formats should be rejected")
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_export():
+    """Test the method 'export' of the Map classes"""
+
+    print("Running the tests for the method 'export'...")
+
+    formats = ["npz"]
+    for extension, module in (("h5", "h5py"), ("parquet", "pyarrow")):
+        try:
+            __import__(module)
+            formats.append(extension)
+        except ImportError:
+            print("Skipping the %s export (%s is not installed)" % (extension, module))
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        bd = Bifurcation([3, 4], [0, 1], 20, 50, chunk_size=300)
+        r, states = bd.getxy()
+
+        for extension in formats:
+            filename = os.path.join(tmpdir, "bifurcation." + extension)
+            bd.export(filename)
+
+            if extension == "npz":
+                data = np.load(filename)
+                params = json.loads(str(data["params"]))
+                er, estates = data["r"], data["states"]
+            elif extension == "h5":
+                import h5py
+
+                with h5py.File(filename, "r") as data:
+                    params = json.loads(data.attrs["params"])
+                    er, estates = data["r"][:], data["states"][:]
+            else:
+                import pyarrow.parquet
+
+                Map.ensure(
+                    pyarrow.parquet.ParquetFile(filename).num_row_groups == 4,
+                    "Each chunk should be a Parquet row group",
+                )
+                data = pyarrow.parquet.read_table(filename)
+                params = json.loads(data.schema.metadata[b"params"])
+                er = data["r"].to_numpy()
+                estates = np.array(data["states"].to_pylist())
+
+            Map.ensure(
+                params["map"] == "logistic" and params["n"] == 20 and params["s"] == 50,
+                "Bad run parameters exported to %s" % extension,
+            )
+            Map.ensure(
+                np.array_equal(er, r) and np.array_equal(estates, states.T),
+                "Bad bifurcation data exported to %s" % extension,
+            )
+
+        filename = os.path.join(tmpdir, "finalstate.npz")
+        fs = FinalState(3.2, 100, 0.5, 500, tol=1e-10)
+        fs.export(filename)
+        data = np.load(filename)
+        Map.ensure(np.array_equal(data["x"], fs.x), "Bad final states exported")
+        Map.ensure(json.loads(str(data["params"]))["period"] == 2, "Bad period")
+
+        filename = os.path.join(tmpdir, "logisticdiff.npz")
+        LogisticDiff(4.0, 50, 0.2, 0.3, 10).export(filename)
+        data = np.load(filename)
+        Map.ensure(data["x"].shape == (51, 2), "Bad orbits exported")
+        Map.ensure(data["t"][0] == 10, "Bad times exported")
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def tests():
+    test_class_exporter()
+    test_export()
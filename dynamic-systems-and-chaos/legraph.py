@@ -6,8 +6,20 @@
 
 import sys
 
-from lelib import Logistic, LogisticDiff
-from utils import argparser, die
+import matplotlib
+import numpy as np
+
+from lecache import Cache
+from lelib import Logistic, LogisticDiff, LogisticEnsemble
+from leprofile import Profiler
+from utils import (
+    add_backend_arguments,
+    add_cache_arguments,
+    add_map_argument,
+    add_output_arguments,
+    argparser,
+    die,
+)
 
 
 def parse_args():
@@ -21,7 +33,11 @@ def parse_args():
       %(prog)s --x0 0.2 --x1 0.2000001 -r 4.0 -n 50
       %(prog)s -0 0.2 -r 3.6 -n 5000 --dots-only
       %(prog)s -0 0.9 -r 4.5 -n 50 --map=cubic
-      %(prog)s -0 0.4 -r 0.8 -n 50 --map=sine"""
+      %(prog)s -0 0.4 -r 0.8 -n 50 --map=sine
+      %(prog)s -0 0.2 -1 0.2000001 -r 4.0 -n 50 --export=orbits.npz
+      # ensemble of 1000 nearby seeds
+      %(prog)s --seeds 0.2:0.2001:1000 -r 4.0 -n 60 --threshold 0.05
+      %(prog)s --seeds 0.2,0.21,0.22 -r 3.7 -n 50"""
 
     parser = argparser(descr, examples)
 
@@ -33,7 +49,6 @@ def parse_args():
         action="store",
         dest="x0",
         type=float,
-        required=True,
         help="1st initial condition",
     )
     parser.add_argument(
@@ -44,6 +59,23 @@ def parse_args():
         type=float,
         help="2nd initial condition (optional)",
     )
+    parser.add_argument(
+        "-e",
+        "--seeds",
+        action="store",
+        dest="seeds",
+        help="ensemble of initial conditions, either a comma separated list "
+        "or a range 'start:stop:count' (replaces --x0 and --x1)",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        action="store",
+        dest="threshold",
+        type=float,
+        default=0.1,
+        help="divergence threshold of the ensemble (default: %(default)s)",
+    )
     parser.add_argument(
         "-d",
         "--dots-only",
@@ -78,30 +110,65 @@ def parse_args():
         required=True,
         help="number of iterations",
     )
-    parser.add_argument(
-        "-m",
-        "--map",
-        action="store",
-        dest="map_name",
-        default="logistic",
-        choices=["logistic", "cubic", "sine"],
-        help="select the desired map (logistic, cubic, or sine)",
-    )
+    add_map_argument(parser)
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
 
     return parser.parse_args()
 
 
+def parse_seeds(seeds):
+    """Convert the argument of --seeds into a vector of initial conditions:
+    "0.2,0.3" --> [0.2, 0.3], "0.2:0.3:3" --> [0.2, 0.25, 0.3]"""
+
+    try:
+        if ":" in seeds:
+            start, stop, count = seeds.split(":")
+            return np.linspace(float(start), float(stop), int(count))
+        return np.array([float(seed) for seed in seeds.split(",")])
+    except ValueError:
+        die(2, "bad list or range of initial conditions: " + seeds)
+
+
 def main():
     args = parse_args()
 
-    lemap = (
-        LogisticDiff(args.r, args.n, args.x0, args.x1, args.s, args.map_name)
-        if args.x1
-        else Logistic(args.r, args.n, args.x0, args.s, args.map_name)
-    )
-
+    if args.seeds:
+        lemap = LogisticEnsemble(
+            args.r, args.n, parse_seeds(args.seeds), args.s, args.map_name
+        )
+        lemap.threshold = args.threshold
+    elif args.x0 is None:
+        die(2, "one of the arguments -0/--x0 -e/--seeds is required")
+    elif args.x1:
+        lemap = LogisticDiff(args.r, args.n, args.x0, args.x1, args.s, args.map_name)
+    else:
+        lemap = Logistic(args.r, args.n, args.x0, args.s, args.map_name)
+
+    lemap.backend = args.backend
+    lemap.precision = args.precision
+    lemap.cache = None if args.nocache else Cache(args.cachedir)
     lemap.plotdots = not args.dotsonly
-    lemap.plot()
+
+    if args.profile:
+        lemap.profiler = Profiler()
+
+    if args.export:
+        try:
+            lemap.export(args.export)
+        except (ImportError, ValueError) as e:
+            die(2, str(e))
+
+    if args.output:
+        # render the plot without any GUI
+        matplotlib.use("Agg")
+        lemap.save(args.output, args.dpi)
+    elif not args.export:
+        lemap.plot()
+
+    if args.profile:
+        lemap.profiler.write(args.profile)
 
 
 if __name__ == "__main__":
@@ -13,22 +13,550 @@ __version__ = "3"
 __email__ = "davide.madrisan@gmail.com"
 __status__ = "stable"
 
+import ast
+import collections
+import configparser
+import contextlib
+import hashlib
+import multiprocessing
 import numpy as np
-import matplotlib.pyplot as plt
-from math import pi, sin
+from math import pi
+
+from leexport import Exporter
+from leprofile import Profiler
+
+
+def _cubic(r, x):
+    """The Cubic Map (accepts both scalars and numpy arrays)"""
+    return r * x**2 * (1.0 - x)
+
+
+def _logistic(r, x):
+    """The Logistic Map (accepts both scalars and numpy arrays)"""
+    return r * x * (1.0 - x)
+
+
+def _sine(r, x):
+    """The Sine Map (accepts both scalars and numpy arrays)"""
+    return r * np.sin(pi * x / 2.0)
+
+
+def _cubic_derivative(r, x):
+    """The derivative of the Cubic Map"""
+    return r * x * (2.0 - 3.0 * x)
+
+
+def _logistic_derivative(r, x):
+    """The derivative of the Logistic Map"""
+    return r * (1.0 - 2.0 * x)
+
+
+def _sine_derivative(r, x):
+    """The derivative of the Sine Map"""
+    return r * pi / 2.0 * np.cos(pi * x / 2.0)
+
+
+def _henon(params, state):
+    """The Henon Map (the parameters and the components of the state are
+    sequences of scalars or numpy arrays)"""
+    (a, b), (x, y) = params, state
+    return 1.0 - a * x * x + y, b * x
+
+
+def _lozi(params, state):
+    """The Lozi Map, a piecewise linear variant of the Henon Map"""
+    (a, b), (x, y) = params, state
+    return 1.0 - a * np.abs(x) + y, b * x
+
+
+def _standard(params, state):
+    """The Chirikov Standard Map, on the torus [0, 2pi) x [0, 2pi)"""
+    (k,), (theta, p) = params, state
+    p = np.mod(p + k * np.sin(theta), 2.0 * pi)
+    return np.mod(theta + p, 2.0 * pi), p
+
+
+def _pyplot():
+    """Import matplotlib.pyplot only when a figure is actually needed, so that
+    the computations do not pay for the matplotlib startup time and memory"""
+
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+# The backends available for iterating the orbits:
+# 'numba' requires the optional Numba JIT compiler, 'numpy' is always available,
+# and 'auto' selects 'numba' when installed and the batch is large enough to
+# pay back the loading of Numba and of the compiled code, and 'numpy' otherwise
+BACKENDS = ["auto", "numba", "numpy"]
+
+# The cost of a batch for the numpy backend, in map evaluations, from which
+# 'auto' selects numba (about the 0.3 s of loading Numba and the compiled
+# code): every iteration of the batch costs, besides the evaluations of its
+# orbits, about as much as JIT_STEP_EVALUATIONS evaluations, so that a single
+# orbit is worth compiling from about 10**5 iterations
+JIT_MIN_EVALUATIONS = 5 * 10**7
+JIT_STEP_EVALUATIONS = 400
+
+# The floating point types available for iterating the orbits:
+# float32 is faster and halves the memory, longdouble (extended precision
+# on most platforms) delays the loss of information in the chaotic orbits.
+# The numba kernels only run in double precision: the other ones use numpy
+PRECISIONS = {"float32": np.float32, "float64": np.float64, "longdouble": np.longdouble}
+
+# The labels of the attractors classified by Map.scan(): the positive ones
+# are the periods of the cycles (1 for the fixed points), UNRESOLVED marks
+# the orbits neither converged to a cycle nor chaotic (longer cycles, or
+# orbits still approaching a cycle near a bifurcation point)
+ESCAPED = -2  # the orbit left the range of the map
+CHAOTIC = -1  # the orbit has a positive Lyapunov exponent
+UNRESOLVED = 0
+
+# The definition of a map: the ranges of r and of the states, the kernel
+# (a function of r and x accepting both scalars and numpy arrays), its
+# derivative, and the source of the user maps (None for the built-in ones)
+MapDefinition = collections.namedtuple(
+    "MapDefinition", "rmin rmax ymin ymax function derivative source"
+)
+
+# The registry of the maps known by the class Map (see define_map)
+MAPS = collections.OrderedDict(
+    [
+        ("cubic", MapDefinition(0, 6.5, 0, 1, _cubic, _cubic_derivative, None)),
+        (
+            "logistic",
+            MapDefinition(0, 4.0, 0, 1, _logistic, _logistic_derivative, None),
+        ),
+        ("sine", MapDefinition(0, 2.0, 0, 2, _sine, _sine_derivative, None)),
+    ]
+)
+
+# The definition of a map of a vector state: its description, the names and
+# the default values of its parameters, the names and the plot ranges of the
+# components of the state, and the kernel (see _henon)
+VectorMapDefinition = collections.namedtuple(
+    "VectorMapDefinition", "longname parameters defaults variables ranges function"
+)
+
+# The registry of the maps known by the class VectorMap
+VECTOR_MAPS = collections.OrderedDict(
+    [
+        (
+            "henon",
+            VectorMapDefinition(
+                "Henon Map",
+                ("a", "b"),
+                (1.4, 0.3),
+                ("x", "y"),
+                ((-1.5, 1.5), (-0.45, 0.45)),
+                _henon,
+            ),
+        ),
+        (
+            "lozi",
+            VectorMapDefinition(
+                "Lozi Map",
+                ("a", "b"),
+                (1.7, 0.5),
+                ("x", "y"),
+                ((-1.5, 1.5), (-0.75, 0.75)),
+                _lozi,
+            ),
+        ),
+        (
+            "standard",
+            VectorMapDefinition(
+                "Standard Map",
+                ("K",),
+                (0.971635,),
+                ("theta", "p"),
+                ((0, 2 * pi), (0, 2 * pi)),
+                _standard,
+            ),
+        ),
+    ]
+)
+
+# The kernels that can be compiled by numba (see _jit_compile): the ones of
+# the built-in maps, whose compiled code is cached on disk, and of the maps
+# defined by expressions
+_jit_builtin_kernels = frozenset([_cubic, _logistic, _sine])
+_jit_kernels = set(_jit_builtin_kernels)
+
+# The functions and the constants available in the expressions of the user
+# maps. The derivative of the expressions calling the non analytic ones is
+# estimated with finite differences instead of a complex step
+_FUNCTIONS = dict(
+    (name, getattr(np, name))
+    for name in (
+        "sin cos tan arcsin arccos arctan sinh cosh tanh exp log log10 sqrt "
+        "abs minimum maximum floor"
+    ).split()
+)
+_NONANALYTIC = set(["abs", "minimum", "maximum", "floor"])
+_CONSTANTS = {"pi": np.pi, "e": np.e}
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd)
+
+
+def _compile(expression, constant=False):
+    """Compile 'expression', a function of r and x, into a numpy function
+    evaluated at once on whole arrays (and that numba can compile too).
+    Return the function and whether the expression is analytic"""
+
+    try:
+        tree = ast.parse("(%s)" % expression.strip(), mode="eval")
+    except SyntaxError:
+        raise ValueError("Invalid expression %r" % expression)
+
+    calls = set(id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call))
+    names = set()
+    analytic = True
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if id(node) in calls:
+                valid = node.id in _FUNCTIONS
+                analytic &= node.id not in _NONANALYTIC
+            else:
+                valid = node.id in _CONSTANTS or node.id in ("r", "x")
+            if not valid:
+                raise ValueError("Unknown name %r in %r" % (node.id, expression))
+            names.add(node.id)
+        elif isinstance(node, ast.Call):
+            valid = isinstance(node.func, ast.Name) and not node.keywords
+        elif isinstance(node, ast.Constant):
+            valid = type(node.value) in (int, float)
+        else:
+            valid = isinstance(
+                node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + _OPERATORS
+            )
+        if not valid:
+            raise ValueError("Unsupported syntax in %r" % expression)
+        analytic &= not isinstance(node, ast.Mod)
+
+    source = "(%s)" % expression.strip()
+    if "x" not in names:
+        if not constant:
+            raise ValueError("The expression %r does not depend on x" % expression)
+        source += " + 0 * x"  # return an array of the shape of x
+
+    namespace = {"__builtins__": {}}
+    namespace.update(_FUNCTIONS)
+    namespace.update(_CONSTANTS)
+    function = eval(compile("lambda r, x: " + source, "<map>", "eval"), namespace)
+
+    return function, analytic
+
+
+def _complex_step(function):
+    """Return the derivative of the analytic 'function' of r and x, exact to
+    the rounding errors, computed with a step along the imaginary axis"""
+
+    def derivative(r, x):
+        return function(r, x + 1e-20j).imag * 1e20
+
+    return derivative
+
+
+def _central_difference(function):
+    """Return the derivative of 'function' of r and x estimated with central
+    differences (for the expressions that are not analytic)"""
+
+    def derivative(r, x):
+        x = np.asarray(x, dtype=np.result_type(x, 1.0))
+        h = np.sqrt(np.finfo(x.dtype).eps) * np.maximum(1, np.abs(x))
+        return (function(r, x + h) - function(r, x - h)) / (2 * h)
+
+    return derivative
+
+
+def define_map(name, expression, r, y, derivative=None):
+    """Add to the registry MAPS the user map 'name' computing 'expression'
+    (for instance "r*x*(1-x)**2") for the growth rates in the range r and
+    the states in the range y. The expressions can contain numbers, r, x,
+    the arithmetic operators, and the functions and constants of _FUNCTIONS
+    and _CONSTANTS. The expressions are compiled once into numpy functions
+    (and by numba, when installed, like the built-in maps). The derivative,
+    needed for the Lyapunov exponents, is computed from the expression
+    when the optional expression 'derivative' is not given"""
+
+    if not name.isidentifier():
+        raise ValueError("Invalid map name %r" % name)
+    if name in MAPS and MAPS[name].source is None:
+        raise ValueError("The built-in map %s cannot be redefined" % name)
+
+    rmin, rmax = (float(value) for value in r)
+    ymin, ymax = (float(value) for value in y)
+    if not (rmin < rmax and ymin < ymax):
+        raise ValueError("Empty range of the map %s" % name)
+
+    function, analytic = _compile(expression)
+    if derivative is not None:
+        derivative_function = _compile(derivative, constant=True)[0]
+    elif analytic:
+        derivative_function = _complex_step(function)
+    else:
+        derivative_function = _central_difference(function)
+
+    _jit_kernels.add(function)
+    MAPS[name] = MapDefinition(
+        rmin,
+        rmax,
+        ymin,
+        ymax,
+        function,
+        derivative_function,
+        {
+            "expression": expression,
+            "r": [rmin, rmax],
+            "y": [ymin, ymax],
+            "derivative": derivative,
+        },
+    )
+
+
+def load_maps(filename):
+    """Define the user maps described in the sections of the configuration
+    file 'filename' and return their names. For instance:
+
+        [quadratic]
+        expression = r*x*(1-x)**2
+        r = 0:6.75
+        y = 0:1
+        ; optional
+        derivative = r*(1-x)*(1-3*x)"""
+
+    config = configparser.ConfigParser()
+    if not config.read(filename):
+        raise IOError("Cannot read the map file %s" % filename)
+
+    for name in config.sections():
+        section = config[name]
+        try:
+            ranges = [
+                [float(value) for value in section[key].split(":")] for key in "ry"
+            ]
+            define_map(name, section["expression"], *ranges, section.get("derivative"))
+        except KeyError as e:
+            raise ValueError("%s: the map %s has no %s" % (filename, name, e))
+        except ValueError as e:
+            raise ValueError("%s: %s" % (filename, e))
+
+    return config.sections()
+
+
+def _bins(values, low, high, bins):
+    """Return the indexes of the bins of [low, high] the values fall in,
+    the last bin being closed as in numpy.histogram, and -1 for the values
+    out of range (or NaN)"""
+
+    edges = np.linspace(low, high, bins + 1)
+    index = np.searchsorted(edges, values, side="right") - 1
+    index[values == high] = bins - 1
+    index[index >= bins] = -1
+    return index
+
+
+_jit_orbits = {}
+
+
+def _make_jit_orbit(numba, kernel):
+    """Compile with numba the functions iterating 'kernel' for all the
+    (r, x0) pairs and storing the last n+1 states in 'out': the second one
+    also stops the orbits converged to a cycle (see Map.converged_states).
+    The machine code of the built-in kernels is cached on disk, so that it
+    is compiled only once, and not by every run of the scripts"""
+
+    cache = kernel in _jit_builtin_kernels
+    f = numba.njit(kernel, cache=cache)
+    if cache:
+        # the cache index of the closures below hashes the pickle of 'f',
+        # which holds a random identifier unless it is set here, by a
+        # private method of numba: without it, the code is not cached
+        try:
+            f._set_uuid(
+                "%s.%s-%s"
+                % (
+                    kernel.__module__,
+                    kernel.__name__,
+                    hashlib.sha1(kernel.__code__.co_code).hexdigest(),
+                )
+            )
+        except (AttributeError, AssertionError):
+            cache = False
+            f = numba.njit(kernel)
+
+    @numba.njit(cache=cache)
+    def orbit(r, x0, n, s, out):
+        # a row at a time: the orbits are computed side by side, and the
+        # states are stored contiguously
+        x = x0.copy()
+        for _ in range(s):
+            for j in range(r.size):
+                x[j] = f(r[j], x[j])
+        out[0] = x
+        for t in range(1, n + 1):
+            for j in range(r.size):
+                out[t, j] = f(r[j], out[t - 1, j])
+
+    @numba.njit(cache=cache)
+    def converged(r, x0, n, s, tol, maxperiod, out, periods, steps):
+        hlen = 2 * maxperiod + 1
+        history = np.empty(hlen)
+        for j in range(r.size):
+            x = x0[j]
+            history[0] = x
+            if s == 0:
+                out[0, j] = x
+            t = 0
+            period = 0
+            while t < s + n and period == 0:
+                t += 1
+                x = f(r[j], x)
+                history[t % hlen] = x
+                if t >= s:
+                    out[t - s, j] = x
+                if t < hlen - 1 or t % maxperiod != 0 or t == s + n:
+                    continue
+                # see Map._detect_cycles
+                for p in range(1, maxperiod + 1):
+                    dmax = 0.0
+                    i = 0
+                    while i < p:
+                        d = abs(history[(t - i) % hlen] - history[(t - i - p) % hlen])
+                        if d >= 2 * tol:
+                            break
+                        dmax = max(dmax, d)
+                        i += 1
+                    if i < p:
+                        continue
+                    d0 = history[t % hlen] - history[(t - p) % hlen]
+                    dp = history[(t - p) % hlen] - history[(t - 2 * p) % hlen]
+                    if not (
+                        dmax < tol / 1024
+                        or d0 == 0
+                        or abs(d0) < abs(dp)
+                        and dmax * abs(d0) < tol * abs(dp - d0)
+                    ):
+                        continue
+                    # the number of distinct points of the cycle
+                    points = np.sort(history[(t - np.arange(p)) % hlen])
+                    distinct = 1
+                    for i in range(1, p):
+                        if points[i] - points[i - 1] >= 2 * tol:
+                            distinct += 1
+                    period = distinct if p % distinct == 0 else p
+                    break
+            periods[j] = period
+            steps[j] = t
+            if period:
+                for row in range(max(0, t - s + 1), n + 1):
+                    m = s + row - t
+                    out[row, j] = history[(t - period + 1 + (m - 1) % period) % hlen]
+
+    return orbit, converged
+
+
+def _jit_compile(kernel):
+    """Return the compiled functions for 'kernel', or None if Numba is
+    not installed or the kernel is not the one of a map of the registry"""
+
+    if kernel not in _jit_orbits:
+        try:
+            import numba
+        except ImportError:
+            _jit_orbits[kernel] = None
+        else:
+            _jit_orbits[kernel] = (
+                _make_jit_orbit(numba, kernel) if kernel in _jit_kernels else None
+            )
+
+    return _jit_orbits[kernel]
+
+
+def _jit_orbit(kernel):
+    """Return the compiled orbit function for 'kernel' (or None)"""
+
+    functions = _jit_compile(kernel)
+    return functions and functions[0]
+
+
+def _jit_converged(kernel):
+    """Return the compiled early terminating orbit function (or None)"""
+
+    functions = _jit_compile(kernel)
+    return functions and functions[1]
+
+
+def _shard_map(mapname, source, backend, precision):
+    """Return the Map object used by a worker of a process pool, defining
+    the user map 'mapname' when the worker process does not know it"""
+
+    if source is not None and mapname not in MAPS:
+        define_map(mapname, **source)
+
+    m = Map(mapname)
+    m.backend = backend
+    m.precision = precision
+    m.profiler = Profiler()  # for counting the map evaluations
+    return m
+
+
+def _final_states_shard(args):
+    """Compute the final states of a shard of growth rates
+    (helper function executed by the workers of a process pool)"""
+
+    mapname, source, backend, precision, r, n, x0, s, tol = args
+
+    m = _shard_map(mapname, source, backend, precision)
+    return m.final_states(r, n, x0, s, tol=tol), m.profiler.evaluations
+
+
+def _scan_shard(args):
+    """Classify the attractors of a shard of (r, x0) pairs
+    (helper function executed by the workers of a process pool)"""
+
+    mapname, source, backend, precision, r, x0, n, s, tol, maxperiod = args
+
+    m = _shard_map(mapname, source, backend, precision)
+    return m._classify(r, x0, n, s, tol, maxperiod), m.profiler.evaluations
+
+
+def _vector_states_shard(args):
+    """Compute the final states of a shard of the parameters of a map of
+    a vector state (helper function executed by the workers of a pool)"""
+
+    mapname, precision, params, x0, n, s = args
+
+    m = VectorMap(mapname)
+    m.precision = precision
+    m.profiler = Profiler()  # for counting the map evaluations
+    return m.final_states(params, n, x0, s), m.profiler.evaluations
 
 
 class Map(object):
     """Class that provides the map functions along with r and y ranges"""
 
-    def __init__(self, mapname="logistic"):
-        params = {
-            # rmin rmax ymin ymax function
-            "cubic": [0, 6.5, 0, 1, lambda r, x: r * x**2 * (1.0 - x)],
-            "logistic": [0, 4.0, 0, 1, lambda r, x: r * x * (1.0 - x)],
-            "sine": [0, 2.0, 0, 2, lambda r, x: r * sin(pi * x / 2.0)],
-        }
+    __slots__ = (
+        "map_name",
+        "map_longname",
+        "map_rmin",
+        "map_rmax",
+        "map_ymin",
+        "map_ymax",
+        "map_function",
+        "map_derivative",
+        "map_source",
+        "map",
+        "_backend",
+        "_precision",
+        "_pool",
+        "cache",
+        "profiler",
+    )
 
+    def __init__(self, mapname="logistic"):
         self.map_name = mapname
         self.map_longname = "%s Equation" % mapname.capitalize()
 
@@ -39,29 +567,603 @@ class Map(object):
                 self.map_ymin,
                 self.map_ymax,
                 self.map_function,
-            ) = params[mapname]
+                self.map_derivative,
+                self.map_source,
+            ) = MAPS[mapname]
             self.map = self._mapper
         except Exception as e:
             raise type(e)("Unknown map name " + mapname)
 
+        self._backend = "auto"
+        self._precision = "float64"
+        self._pool = None  # The process pool kept open by _pooled()
+        self.cache = None  # An optional lecache.Cache object
+        self.profiler = None  # An optional leprofile.Profiler object
+
     @staticmethod
     def ensure(expression, message, *argv):
         if not expression:
             raise AssertionError(message % (argv) if argv else message)
 
-    def _mapper(self, r, x):
+    def _check_rate(self, r):
+        """Make sure that the growth rate (or all the growth rates
+        of the numpy vector 'r') are in the range of the map"""
+
+        # plain comparisons for the scalars, checked at each call of map()
+        if isinstance(r, np.ndarray):
+            valid = np.all((r >= self.map_rmin) & (r <= self.map_rmax))
+        else:
+            valid = self.map_rmin <= r <= self.map_rmax
         self.ensure(
-            (r >= self.map_rmin and r <= self.map_rmax),
+            valid,
             "The growth parameter r must be between %g and %g",
             self.map_rmin,
             self.map_rmax,
         )
+
+    def _mapper(self, r, x):
+        self._check_rate(r)
+        if self.profiler is not None:
+            self.profiler.count(np.broadcast(r, x).size)
         return self.map_function(r, x)
 
+    def _phase(self, name):
+        """Return a context manager measuring the phase 'name' of the
+        computation when a profiler is set (see leprofile.Profiler)"""
+
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(name)
+
+    @contextlib.contextmanager
+    def _pooled(self, jobs):
+        """Return a context manager keeping a pool of 'jobs' worker
+        processes (0: all the CPUs) open for all the calls of _parallel()
+        in its block, instead of starting a new pool for each call"""
+
+        jobs = jobs or multiprocessing.cpu_count()
+        if jobs <= 1 or self._pool is not None:
+            yield
+            return
+
+        self._pool = multiprocessing.Pool(jobs)
+        try:
+            yield
+        finally:
+            pool, self._pool = self._pool, None
+            pool.close()
+            pool.join()
+
+    def _count(self, evaluations):
+        """Count the map evaluations when a profiler is set"""
+
+        if self.profiler is not None:
+            self.profiler.count(evaluations)
+
+    def _iterate(self, r, x0, n, s=0):
+        """Iterate the map, with the selected backend, and return the n+1
+        states following the first 's' (not stored) iterations"""
+
+        r = np.asarray(r, dtype=self.dtype)
+        x0 = np.asarray(x0, dtype=self.dtype)
+        shape = np.broadcast(r, x0).shape
+        evaluations = np.prod(shape) * (n + s)
+        self._count(evaluations)
+
+        jit_orbit = self._jit(_jit_orbit, np.prod(shape), n + s)
+        if jit_orbit is not None:
+            # copies of the broadcast (read-only) arrays
+            rb, xb = (a.flatten() for a in np.broadcast_arrays(r, x0))
+            states = np.empty((n + 1, rb.size), dtype=self.dtype)
+            jit_orbit(rb, xb, n, s, states)
+            return states.reshape((n + 1,) + shape)
+
+        x = np.broadcast_to(x0, shape)
+        for _ in range(s):
+            x = self.map_function(r, x)
+
+        states = np.empty((n + 1,) + shape, dtype=self.dtype)
+        states[0] = x
+        for t in range(1, n + 1):
+            states[t] = self.map_function(r, states[t - 1])
+
+        return states
+
+    def _jit(self, compiled, orbits, steps):
+        """Return the function compiled by numba returned by
+        'compiled(kernel)', or None if the numpy backend must be used for
+        iterating a batch of 'orbits' orbits 'steps' times"""
+
+        if self._backend == "numpy" or self._precision != "float64":
+            return None
+        cost = (orbits + JIT_STEP_EVALUATIONS) * steps
+        if self._backend == "auto" and cost < JIT_MIN_EVALUATIONS:
+            return None
+        return compiled(self.map_function)
+
+    def _cached(self, compute, r, x0, n, s, **params):
+        """Return the states computed by 'compute()', looking for them in
+        the cache first (if any) and storing them there otherwise"""
+
+        with self._phase("compute"):
+            if self.cache is None:
+                return compute()
+            return self._lookup(compute, r, x0, n, s, **params)
+
+    def _lookup(self, compute, r, x0, n, s, **params):
+        """Look for the states in the cache, and store them if missing"""
+
+        key = self.cache.key(
+            map=self.map_name,
+            source=self.map_source,
+            version=__version__,
+            precision=self._precision,
+            r=r,
+            x0=x0,
+            n=n,
+            s=s,
+            **params
+        )
+        states = self.cache.get(key)
+        if states is None:
+            states = compute()
+            self.cache.put(key, states)
+
+        return states
+
+    def plot(self):
+        """Plot the figure built by the method figure() of the derived
+        classes in an interactive window"""
+
+        plt = _pyplot()
+
+        with self._phase("figure"):
+            fig = self.figure()
+        if self.profiler is not None:
+            with self._phase("render"):
+                fig.canvas.draw()
+        plt.show()
+
+    def save(self, filename, dpi=None):
+        """Save the figure built by the method figure() of the derived
+        classes to 'filename' (the format is given by its extension)
+        and release it"""
+
+        plt = _pyplot()
+
+        with self._phase("figure"):
+            fig = self.figure()
+        try:
+            with self._phase("render"):
+                fig.savefig(filename, dpi=dpi)
+        finally:
+            plt.close(fig)
+
+    def getparams(self):
+        """Return the parameters of the computation (see export)"""
+
+        params = {
+            "map": self.map_name,
+            "precision": self._precision,
+            "version": __version__,
+        }
+        if self.map_source is not None:
+            params["source"] = self.map_source
+        return params
+
+    def export(self, filename):
+        """Write the arrays yielded by the method iterarrays() of the derived
+        classes, chunk by chunk, and the parameters returned by getparams()
+        to 'filename' (see leexport.FORMATS for the supported formats)"""
+
+        with self._phase("export"), Exporter(filename, self.getparams()) as exporter:
+            for arrays in self.iterarrays():
+                exporter.write(**arrays)
+
+    def orbit(self, r, x0, n, s=0):
+        """Return a numpy array containing the n+1 states x0, f(x0), ...
+        of the orbit, following the first 's' iterations (which are not
+        stored). When 'r' and/or 'x0' are vectors, all the orbits are
+        iterated at once and stored in the columns of the returned array"""
+
+        self._check_rate(r)
+        self.ensure(n >= 0, "The number of iterations cannot be negative.")
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+
+        return self._cached(lambda: self._iterate(r, x0, n, s), r, x0, n, s)
+
+    def final_states(self, r, n, x0=0.5, s=0, jobs=1, tol=None):
+        """Iterate the map for all the growth rates in the vector 'r' at once
+        and return a (n+1, len(r)) numpy array containing, for each r, the
+        final states left after skipping the first 's' iterations.
+        When 'jobs' is greater than one (or zero, meaning all the available
+        CPUs) the vector 'r' is split in shards computed by a process pool.
+        When 'tol' is set, the orbits converged to a cycle stop early
+        (see converged_states)"""
+
+        r = np.asarray(r, dtype=self.dtype)
+        self.ensure(r.ndim == 1, "The growth rates must be a vector.")
+        self._check_rate(r)
+        self.ensure(n >= 0, "The number of iterations cannot be negative.")
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+        self.ensure(jobs >= 0, "The number of jobs cannot be negative.")
+
+        return self._cached(
+            lambda: self._parallel(r, x0, n, s, jobs, tol), r, x0, n, s, tol=tol
+        )
+
+    def converged_states(self, r, n, x0=0.5, s=0, tol=1e-9, maxperiod=32):
+        """Like final_states(), but stop iterating the orbits as soon as
+        they converge, within 'tol', to a fixed point or a cycle of period
+        at most 'maxperiod', and fill their final states with the cycle.
+        Return the final states and the vector of the detected periods
+        (0 for the orbits, chaotic or still transient, that did not converge)"""
+
+        r = np.asarray(r, dtype=self.dtype)
+        self.ensure(r.ndim == 1, "The growth rates must be a vector.")
+        self._check_rate(r)
+        self.ensure(n >= 0, "The number of iterations cannot be negative.")
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+        self.ensure(tol > 0, "The tolerance must be greater than zero.")
+        self.ensure(maxperiod > 0, "The maximum period must be greater than zero.")
+
+        jit_converged = self._jit(_jit_converged, r.size, n + s)
+        if jit_converged is not None:
+            states = np.empty((n + 1, r.size), dtype=self.dtype)
+            periods = np.zeros(r.size, dtype=int)
+            steps = np.zeros(r.size, dtype=int)
+            x0 = np.full(r.size, x0, dtype=self.dtype)
+            jit_converged(r, x0, n, s, tol, maxperiod, states, periods, steps)
+            self._count(steps.sum())
+            return states, periods
+
+        # ring buffer with the last 2*maxperiod+1 states of the active orbits,
+        # held by the rows of 'out', still unused, while the checks fall in
+        # the transient
+        hlen = 2 * maxperiod + 1
+        out = np.empty((n + 1, r.size), dtype=self.dtype)
+        if s >= hlen and n + 1 >= hlen:
+            history = out[:hlen]
+        else:
+            history = np.empty((hlen, r.size), dtype=self.dtype)
+
+        # the retained states of the active orbits are stored in the first
+        # columns of 'out', the ones of the stopped orbits in the last ones:
+        # 'order' holds the column of the final states of each column
+        order = np.arange(r.size)
+        nstopped = 0
+
+        periods = np.zeros(r.size, dtype=int)
+        active = np.arange(r.size)  # the orbits still being iterated
+        ra = r
+        x = np.full(r.size, x0, dtype=self.dtype)
+        history[0] = x
+        if s == 0:
+            out[0] = x
+
+        # the last check looks at the last hlen states, in the last rows of
+        # 'out' unless they are less than hlen, in the ring buffer otherwise
+        tail = n + 1 < hlen
+
+        # the cycles are looked for every 'interval' iterations, doubled at
+        # each check, the ring buffer being filled in the hlen iterations
+        # preceding it. A check costs about as much as hlen iterations of
+        # the active orbits: when less than a quarter of them converge, or
+        # stopping them saves less than that, the remaining orbits are
+        # iterated as by final_states() and only looked at by the last check
+        interval = check = hlen
+        evaluations = 0
+        for t in range(1, s + n + 1):
+            x = self.map_function(ra, x)
+            evaluations += x.size
+            if t > check - hlen or (tail and t > s + n - hlen):
+                history[t % hlen] = x
+            if t >= s:
+                out[t - s, : active.size] = x
+
+            if t < check or t == s + n:
+                continue
+
+            found = self._detect_cycles(history, t, tol, maxperiod)
+            done = found > 0
+            ndone = np.count_nonzero(done)
+            periods[active[done]] = found[done]
+            interval *= 2
+            check = t + interval
+            if 4 * ndone < active.size or ndone * (s + n - t) < hlen * active.size:
+                check = np.inf
+                continue
+
+            # the stopped orbits, sorted by period, take the last columns
+            # left of the ones stopped before
+            rows = max(0, t - s + 1)
+            cols = np.nonzero(done)[0]
+            cols = cols[np.argsort(found[cols], kind="stable")]
+            found = found[cols]
+            periodic = np.unique(found)
+            bounds = np.searchsorted(found, np.append(periodic, periodic[-1] + 1))
+            # the last p states of each orbit, read before 'out' is written
+            cycles = [
+                history[(t - np.arange(p))[:, np.newaxis] % hlen, cols[lo:hi]]
+                for p, lo, hi in zip(periodic, bounds[:-1], bounds[1:])
+            ]
+            retained = out[:rows, cols]
+            keep = np.nonzero(~done)[0]
+            for row in out[:rows]:
+                row[: keep.size] = row[keep]
+
+            end = r.size - nstopped
+            nstopped += ndone
+            start = r.size - nstopped
+            order[start:end] = active[cols]
+            out[:rows, start:end] = retained
+
+            # x(u) = x(u-p) for u > t: fill the rows following the ones
+            # already computed with the last p states, cycle[i] = x(t-i)
+            for p, lo, hi, cycle in zip(periodic, bounds[:-1], bounds[1:], cycles):
+                for m in range(1, p + 1):
+                    first = t + m - s
+                    if first < rows:
+                        first += (rows - first + p - 1) // p * p
+                    out[first::p, start + lo : start + hi] = cycle[p - m]
+
+            active, ra, x = active[keep], ra[keep], x[keep]
+            if not active.size:
+                break
+            # the ring buffer is entirely rewritten before the next check,
+            # and stays in 'out' while the check falls in the transient
+            if history.base is out and check >= s:
+                history = np.empty((hlen, active.size), dtype=self.dtype)
+            elif tail:
+                history = history[:, keep]
+            else:
+                history = history[:, : active.size]
+
+        # the orbits still iterated may have converged after the last check
+        if active.size and s + n >= hlen:
+            if tail:
+                found = self._detect_cycles(history, s + n, tol, maxperiod)
+            else:
+                found = self._detect_cycles(
+                    out[n + 1 - hlen :, : active.size], hlen - 1, tol, maxperiod
+                )
+            done = found > 0
+            periods[active[done]] = found[done]
+
+        self._count(evaluations)
+        if nstopped:
+            # put the columns in the order of the growth rates, one row at
+            # a time not to allocate a second array of states
+            order[: active.size] = active
+            column = np.argsort(order)
+            for row in out:
+                row[:] = row[column]
+
+        return out, periods
+
+    @staticmethod
+    def _detect_cycles(history, t, tol, maxperiod):
+        """Return, for each column of the ring buffer 'history' (holding the
+        states up to time t, at least 2*maxperiod+1 of them), the smallest
+        period p of the cycle the orbit converged to within 'tol' (0 if none).
+
+        The differences d(i) = x(t-i) - x(t-i-p) of an orbit converging to a
+        p-cycle shrink by the multiplier mu = d(0) / d(p) every p iterations,
+        so its states are about |d(i) mu / (1 - mu)| away from the cycle. An
+        orbit alternating around a fixed point (mu < 0) repeats its states
+        every two iterations much sooner than every iteration, but has the
+        same distance from the fixed point for p = 1 and p = 2"""
+
+        hlen = history.shape[0]
+        found = np.zeros(history.shape[1], dtype=int)
+        current = history[t % hlen]
+
+        for p in range(1, maxperiod + 1):
+            candidates = np.nonzero(
+                (found == 0) & (np.abs(current - history[(t - p) % hlen]) < 2 * tol)
+            )[0]
+            if not candidates.size:
+                continue
+
+            # d[i] = x(t-i) - x(t-i-p) for i = 0, ..., p, converged if
+            # |mu| < 1 and max|d| |mu| < tol |1 - mu| (without dividing by
+            # d[p]), or if the differences are down to the rounding errors
+            states = history[
+                (t - np.arange(2 * p + 1))[:, np.newaxis] % hlen, candidates
+            ]
+            d = states[: p + 1] - states[p:]
+            dmax = np.max(np.abs(d[:p]), axis=0)
+            d0, dp = d[0], d[p]
+            cycle = (dmax < 2 * tol) & (
+                (dmax < tol / 1024)
+                | (d0 == 0)
+                | (
+                    (np.abs(d0) < np.abs(dp))
+                    & (dmax * np.abs(d0) < tol * np.abs(dp - d0))
+                )
+            )
+            if not cycle.any():
+                continue
+
+            found[candidates[cycle]] = p
+            if p > 1:
+                # the period is the number of distinct points of the cycle,
+                # those closer than 2 tol being the same point
+                points = np.sort(states[:p, cycle], axis=0)
+                distinct = 1 + np.sum(np.diff(points, axis=0) >= 2 * tol, axis=0)
+                found[candidates[cycle]] = np.where(p % distinct == 0, distinct, p)
+
+        return found
+
+    def _parallel(self, r, x0, n, s, jobs, tol=None):
+        """Iterate the map with 'jobs' worker processes, each of them
+        computing the final states of a shard of the vector 'r'"""
+
+        jobs = min(jobs or multiprocessing.cpu_count(), r.size)
+        if jobs <= 1:
+            if tol is None:
+                return self._iterate(r, x0, n, s)
+            return self.converged_states(r, n, x0, s, tol)[0]
+
+        shards = [
+            (self.map_name, self.map_source, self._backend, self._precision)
+            + (shard, n, x0, s, tol)
+            for shard in np.array_split(r, jobs)
+        ]
+        with self._pooled(jobs):
+            # Pool.map returns the results in the order of the shards
+            results = self._pool.map(_final_states_shard, shards)
+
+        self._count(sum(result[1] for result in results))
+        return np.concatenate([result[0] for result in results], axis=1)
+
+    def scan(
+        self, r, x0, n=100, s=1000, tol=1e-9, maxperiod=32, jobs=1, chunk_size=None
+    ):
+        """Classify the attractors reached from all the pairs (r, x0) of
+        the vectors 'r' and 'x0', and return a (len(x0), len(r)) matrix of
+        labels: the periods of the cycles, or one of UNRESOLVED, CHAOTIC,
+        and ESCAPED. The orbits are iterated 's' times, stopping the ones
+        converged to a cycle (see converged_states), and their Lyapunov
+        exponents are estimated over the n following iterations.
+        The grid is computed in chunks of (at most) 'chunk_size' pairs,
+        each one split in shards among 'jobs' worker processes"""
+
+        r = np.asarray(r, dtype=self.dtype)
+        x0 = np.asarray(x0, dtype=self.dtype)
+        self.ensure(r.ndim == 1 and x0.ndim == 1, "r and x0 must be vectors.")
+        self._check_rate(r)
+        self.ensure(
+            np.all((x0 >= self.map_ymin) & (x0 <= self.map_ymax)),
+            "The initial conditions should be in [%g, %g].",
+            self.map_ymin,
+            self.map_ymax,
+        )
+        self.ensure(n > 0, "The number of iterations must be greater than zero.")
+        self.ensure(jobs >= 0, "The number of jobs cannot be negative.")
+        self.ensure(maxperiod < 128, "The maximum period must be less than 128.")
+
+        rr, xx = (grid.ravel() for grid in np.meshgrid(r, x0))
+        labels = np.empty(rr.size, dtype=np.int8)
+        chunk_size = chunk_size or rr.size
+        jobs = min(jobs or multiprocessing.cpu_count(), chunk_size)
+
+        with self._pooled(jobs):
+            for start in range(0, rr.size, chunk_size):
+                chunk = slice(start, start + chunk_size)
+                if self._pool is None:
+                    labels[chunk] = self._classify(
+                        rr[chunk], xx[chunk], n, s, tol, maxperiod
+                    )
+                    continue
+
+                shards = [
+                    (self.map_name, self.map_source, self._backend, self._precision)
+                    + shard
+                    + (n, s, tol, maxperiod)
+                    for shard in zip(
+                        np.array_split(rr[chunk], jobs), np.array_split(xx[chunk], jobs)
+                    )
+                ]
+                results = self._pool.map(_scan_shard, shards)
+                self._count(sum(result[1] for result in results))
+                labels[chunk] = np.concatenate([result[0] for result in results])
+
+        return labels.reshape(x0.size, r.size)
+
+    def _classify(self, r, x0, n, s, tol, maxperiod):
+        """Return the labels of the attractors of the (r, x0) pairs"""
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            states, periods = self.converged_states(r, n, x0, s, tol, maxperiod)
+            exponents = self.exponents(r, states)
+
+        # NaN and infinite states are not in range
+        yrange = self.map_ymax - self.map_ymin
+        escaped = ~np.all(
+            (states >= self.map_ymin - yrange) & (states <= self.map_ymax + yrange),
+            axis=0,
+        )
+
+        labels = periods.astype(np.int8)
+        labels[(periods == 0) & (exponents > 0)] = CHAOTIC
+        labels[escaped] = ESCAPED
+
+        return labels
+
+    def lyapunov(self, r, n, x0=0.5, s=0):
+        """Return the Lyapunov exponents of the orbits starting from x0 for
+        all the growth rates in 'r', averaging log|f'(x)| over the n
+        iterations following the first 's' ones. The orbits are not stored"""
+
+        r = np.asarray(r, dtype=self.dtype)
+        self._check_rate(r)
+        self.ensure(n > 0, "The number of iterations must be greater than zero.")
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+
+        x = self._iterate(r, x0, 0, s)[0]
+        total = np.zeros(x.shape, dtype=self.dtype)
+        self._count(x.size * n)
+
+        # log(0) = -inf for the superstable orbits
+        with np.errstate(divide="ignore"):
+            for _ in range(n):
+                total += np.log(np.abs(self.map_derivative(r, x)))
+                x = self.map_function(r, x)
+
+        return total / n
+
+    def exponents(self, r, states):
+        """Return the Lyapunov exponents estimated along the orbits already
+        computed and stored in the columns of 'states' (see final_states)"""
+
+        with np.errstate(divide="ignore"):
+            return np.mean(np.log(np.abs(self.map_derivative(r, states[:-1]))), axis=0)
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @backend.setter
+    def backend(self, value):
+        """Set the backend used for iterating the orbits (see BACKENDS)"""
+        self.ensure(
+            value in BACKENDS,
+            "The backend must be one of: %s",
+            ", ".join(BACKENDS),
+        )
+        self.ensure(
+            value != "numba" or _jit_orbit(self.map_function) is not None,
+            "The numba backend is not available for the %s map",
+            self.map_name,
+        )
+        self._backend = value
+
+    @property
+    def precision(self):
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        """Set the floating point type of the orbits (see PRECISIONS)"""
+        self.ensure(
+            value in PRECISIONS,
+            "The precision must be one of: %s",
+            ", ".join(PRECISIONS),
+        )
+        self._precision = value
+
+    @property
+    def dtype(self):
+        """The numpy type of the orbits for the selected precision"""
+        return np.dtype(PRECISIONS[self._precision])
+
 
 class Logistic(Map):
     """Class for plotting a Logistic/Cubic/Sine Map"""
 
+    __slots__ = ("r", "n", "s", "x0", "_states", "_dotsonly")
+
     def __init__(self, r, n, x0, s=0, mapname="logistic"):
         Map.__init__(self, mapname)
 
@@ -69,8 +1171,9 @@ class Logistic(Map):
         self.n = n  # Number of iterations
         self.s = s  # Number of iterations to skip in the plot
         self.x0 = x0  # The 1st initial condition
-        self.x = self.y1 = []
 
+        # the n+1 states following the skipped ones (computed on demand)
+        self._states = None
         self._dotsonly = False
 
         self.ensure(n > 0, "The number of iterations must be greater than zero.")
@@ -86,6 +1189,8 @@ class Logistic(Map):
         """Plot the dots (x, y) connected by straight lines
         if the parameter 'dotsonly' if set to False"""
 
+        plt = _pyplot()
+
         self.ensure(x.any() and y.any(), "_plotline(): internal error")
         plt.plot(
             x,
@@ -100,39 +1205,63 @@ class Logistic(Map):
         if self.plotdots:
             plt.plot(x, y, color=color, alpha=0.6)
 
-    def getxy(self, fill_value=None):
-        """Set the numpy vectors 'x' and 'y1' containing
-        the iterations (1..n) and the corresponding values
-        of the choosen Map"""
+    def _compute(self):
+        """Return the states of the orbit following the skipped ones"""
 
-        # do not initialize twice the x and y1 vectors
-        if len(self.x) > 0:
-            return
+        # the transient is iterated in place without being stored
+        return self.orbit(self.r, self.x0, self.n, self.s)
 
-        vectlen = self.n + self.s + 1
+    def _getstates(self):
+        """Compute the states (only once) and return them"""
 
-        self.x = np.arange(vectlen)
+        if self._states is None:
+            with self._phase("compute"):
+                self._states = self._compute()
 
-        self.y1 = np.arange(0, vectlen, 1.0)
-        self.y1[0] = self.x0
-        for t in self.x[1:]:
-            self.y1[t] = self.map(self.r, self.y1[t - 1])
+        return self._states
+
+    @property
+    def x(self):
+        """The times s..s+n of the plotted iterations"""
+        return np.arange(self.s, self.s + self.n + 1)
+
+    @property
+    def y1(self):
+        """The states of the orbit at the times 'x'"""
+        return self._getstates()
+
+    def getxy(self, fill_value=None):
+        """Return the numpy vectors 'x' and 'y1' containing the plotted
+        iterations (s..s+n) and the corresponding values of the choosen Map"""
 
         return self.x, self.y1
 
-    def plot(self):
-        """Plot a Logistic, Cubic or Sine map"""
+    def getparams(self):
+        params = Map.getparams(self)
+        params.update(r=self.r, x0=self.x0, n=self.n, s=self.s)
+        return params
+
+    def iterarrays(self):
+        """Yield the arrays to be exported: the times 't' and the states 'x'"""
+
+        yield {"t": self.x, "x": self._getstates()}
+
+    def figure(self):
+        """Build and return the figure of a Logistic, Cubic or Sine map"""
+
+        plt = _pyplot()
 
         self.getxy()
 
+        fig = plt.figure()
         plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
         plt.title(self.map_longname)
         plt.xlabel("time t")
         plt.ylim([self.map_ymin, self.map_ymax])
         plt.grid(True)
-        self._plotline(self.x[self.s :], self.y1[self.s :], "mediumseagreen")
+        self._plotline(self.x, self.y1, "mediumseagreen")
 
-        plt.show()
+        return fig
 
     @property
     def plotdots(self):
@@ -147,34 +1276,64 @@ class Logistic(Map):
 class FinalState(Logistic):
     """Derived class for plotting a Final State Diagram"""
 
+    __slots__ = ("tol", "period", "fill_value")
+
     # By default, set the initial state to .5
     # make 3000 iterations and do no plot the first 2000 ones
-    def __init__(self, r, n=1000, x0=0.5, s=2000, mapname="logistic"):
+    def __init__(self, r, n=1000, x0=0.5, s=2000, mapname="logistic", tol=None):
         Logistic.__init__(self, r, n, x0, s, mapname)
 
-    def getxy(self, fill_value=0.5):
-        """Set the numpy vectors 'x' and 'y1' containing the values of the
-        choosen Map for the first n iterations"""
+        self.tol = tol  # Tolerance for detecting the cycles (None: disabled)
+        self.period = None  # The period of the detected cycle (0 if none)
+        self.fill_value = 0.5  # The ordinate of the plotted states
 
-        # do not initialize twice the x and y1 vectors
-        if len(self.x) > 0:
-            return
+    def _compute(self):
+        if self.tol is None:
+            return self.orbit(self.r, self.x0, self.n, self.s)
+
+        x, periods = self.converged_states([self.r], self.n, self.x0, self.s, self.tol)
+        self.period = periods[0]
 
-        vectlen = self.n + self.s + 1
+        return x[:, 0]
 
-        self.x = np.full(vectlen, self.x0, dtype=np.float64)
-        for t in range(1, vectlen):
-            self.x[t] = self.map(self.r, self.x[t - 1])
+    @property
+    def x(self):
+        """The final states of the orbit"""
+        return self._getstates()
 
-        self.y1 = np.full(vectlen, fill_value, dtype=np.float)
+    @property
+    def y1(self):
+        """A read-only vector (without storage) of constant ordinates"""
+        return np.broadcast_to(np.float64(self.fill_value), self.n + 1)
+
+    def getxy(self, fill_value=0.5):
+        """Return the numpy vectors 'x' and 'y1' containing the final states
+        of the choosen Map (the n iterations following the skipped ones)
+        and the constant 'fill_value'"""
+
+        self.fill_value = fill_value
 
         return self.x, self.y1
 
-    def plot(self):
-        """Plot a Final State Diagram"""
+    def getparams(self):
+        params = Logistic.getparams(self)
+        self._getstates()
+        params.update(tol=self.tol, period=self.period)
+        return params
+
+    def iterarrays(self):
+        """Yield the array to be exported: the final states 'x'"""
+
+        yield {"x": self.x}
+
+    def figure(self):
+        """Build and return the figure of a Final State Diagram"""
+
+        plt = _pyplot()
 
         self.getxy()
 
+        fig = plt.figure()
         plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
         plt.title("Final State Diagram for the " + self.map_longname)
 
@@ -186,8 +1345,8 @@ class FinalState(Logistic):
 
         plt.plot([self.map_ymin, self.map_ymax], [0.5, 0.5], color="black", lw=1)
         plt.plot(
-            self.x[self.s :],
-            self.y1[self.s :],
+            self.x,
+            self.y1,
             color="black",
             linestyle="",
             markerfacecolor="black",
@@ -197,12 +1356,12 @@ class FinalState(Logistic):
         plt.text(
             0.1 * self.map_ymax,
             0.4,
-            "r = %g" % self.r,
+            "r = %g" % self.r + (" (period %d)" % self.period if self.period else ""),
             style="italic",
             bbox={"facecolor": "red", "alpha": 0.5, "pad": 10},
         )
 
-        plt.show()
+        return fig
 
 
 class LogisticDiff(Logistic):
@@ -210,6 +1369,8 @@ class LogisticDiff(Logistic):
     with two different initial conditions, followed by a plot of
     their differences (for a visualization of the Butterfly Effect)"""
 
+    __slots__ = ("x1",)
+
     def __init__(self, r, n, x0, x1, s=0, mapname="logistic"):
         Logistic.__init__(self, r, n, x0, s, mapname)
 
@@ -220,38 +1381,47 @@ class LogisticDiff(Logistic):
             self.map_ymax,
         )
         self.x1 = x1  # The 2st initial condition
-        self.y2 = []
 
-    def getxy(self, fill_value=None):
-        """Set the numpy vectors 'x', 'y1', and 'y2' containing
-        the iterations (1..n) and the corresponding values
-        of the choosen Map"""
+    def _compute(self):
+        # iterate the orbits of both the initial conditions at once
+        return self.orbit(self.r, [self.x0, self.x1], self.n, self.s)
 
-        x, y1 = super(LogisticDiff, self).getxy()
+    @property
+    def y1(self):
+        """The states of the orbit of the 1st initial condition"""
+        return self._getstates()[:, 0]
 
-        # do not initialize twice the vector y2
-        if len(self.y2) > 0:
-            return
+    @property
+    def y2(self):
+        """The states of the orbit of the 2nd initial condition"""
+        return self._getstates()[:, 1]
+
+    def getxy(self, fill_value=None):
+        """Return the numpy vectors 'x', 'y1', and 'y2' containing
+        the plotted iterations (s..s+n) and the corresponding values
+        of the choosen Map"""
 
-        self.y2 = np.arange(0, self.n + self.s + 1, 1.0)
-        self.y2[0] = self.x1
-        for t in self.x[1:]:
-            self.y2[t] = self.map(self.r, self.y2[t - 1])
+        return self.x, self.y1, self.y2
 
-        return x, y1, self.y2
+    def getparams(self):
+        params = Logistic.getparams(self)
+        params.update(x1=self.x1)
+        return params
 
     def getdiffy(self):
         """Return the difference between the two vectors y2 and y1"""
 
         return self.y2 - self.y1
 
-    def plot(self):
-        """Plot a Logistic, Cubic or Sine map with two different seeds (two plots)
-        followed by their difference"""
+    def figure(self):
+        """Build and return the figure of a Logistic, Cubic or Sine map with
+        two different seeds (two plots) followed by their difference"""
+
+        plt = _pyplot()
 
         self.getxy()
 
-        plt.figure(1)
+        fig = plt.figure()
         plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
 
         plt.subplot(211)
@@ -263,25 +1433,172 @@ class LogisticDiff(Logistic):
         plt.ylabel(r"$y_1(t),\ y_2(t)$", fontsize=14)
         plt.ylim([self.map_ymin, self.map_ymax])
         plt.grid(True)
-        self._plotline(self.x[self.s :], self.y1[self.s :], "indianred")
-        self._plotline(self.x[self.s :], self.y2[self.s :], "mediumseagreen")
+        self._plotline(self.x, self.y1, "indianred")
+        self._plotline(self.x, self.y2, "mediumseagreen")
 
-        ydiff = self.y2 - self.y1
+        ydiff = self.getdiffy()
 
         plt.subplot(212)
         plt.title("Difference between the two time series")
         plt.xlabel("time t")
         plt.ylabel(r"$y_2(t) - y_1(t)$", fontsize=14)
         plt.grid(True)
-        self._plotline(self.x[self.s :], ydiff[self.s :], "royalblue")
+        self._plotline(self.x, ydiff, "royalblue")
 
-        plt.show()
+        return fig
+
+
+class LogisticEnsemble(Logistic):
+    """Derived class for plotting a Logistic/Cubic/Sine Map iterated from
+    an ensemble of initial conditions, followed by the spread of the
+    ensemble and the divergence of the seeds from a reference one"""
+
+    __slots__ = ("seeds", "reference", "threshold")
+
+    def __init__(self, r, n, seeds, s=0, mapname="logistic", reference=0):
+        seeds = np.asarray(seeds, dtype=np.float64)
+
+        self.ensure(
+            seeds.ndim == 1 and seeds.size > 0,
+            "The initial conditions must be a non empty vector.",
+        )
+        Logistic.__init__(self, r, n, seeds[0], s, mapname)
+
+        self.ensure(
+            np.all((seeds >= self.map_ymin) & (seeds <= self.map_ymax)),
+            "The initial conditions should be in [%g, %g].",
+            self.map_ymin,
+            self.map_ymax,
+        )
+        self.ensure(
+            0 <= reference < seeds.size, "The reference seed index is out of range."
+        )
+        self.seeds = seeds  # The initial conditions
+        self.reference = reference  # The index of the reference seed
+        self.threshold = 0.1  # Divergence plotted by figure()
+
+    def _compute(self):
+        return self.orbit(self.r, self.seeds, self.n, self.s)
+
+    @property
+    def y(self):
+        """The (n+1, K) matrix containing the orbits of the K seeds"""
+        return self._getstates()
+
+    @property
+    def y1(self):
+        """The orbit of the reference seed"""
+        return self._getstates()[:, self.reference]
+
+    def getxy(self, fill_value=None):
+        """Return the numpy vector 'x' containing the plotted iterations
+        (s..s+n) and the (n+1, K) matrix 'y' of the orbits of the K seeds"""
+
+        return self.x, self.y
+
+    def getparams(self):
+        params = Logistic.getparams(self)
+        params.update(x0=self.seeds, reference=self.reference)
+        return params
+
+    def spread(self):
+        """Return the standard deviation of the ensemble at each time step"""
+
+        return self.y.std(axis=1)
+
+    def divergence(self):
+        """Return the (n+1, K) matrix of the distances of the orbits from
+        the one of the reference seed"""
+
+        return np.abs(self.y - self.y[:, self.reference, None])
+
+    def divergence_time(self, threshold):
+        """Return, for each seed, the first time at which its distance from
+        the reference orbit exceeds 'threshold' (-1 if it never does)"""
+
+        diverged = self.divergence() > threshold
+
+        return np.where(diverged.any(axis=0), self.s + np.argmax(diverged, axis=0), -1)
+
+    def figure(self):
+        """Build and return the figure of a Logistic, Cubic or Sine map with
+        an ensemble of seeds followed by the spread and divergence"""
+
+        plt = _pyplot()
+
+        t = self.x
+        times = self.divergence_time(self.threshold)
+        diverged = times[times >= 0]  # -1 for the seeds that never diverge
+
+        fig = plt.figure()
+        plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
+
+        plt.subplot(211)
+        plt.title(
+            "Time series for a %s with %d initial conditions"
+            % (self.map_longname, self.seeds.size)
+        )
+        plt.ylabel(r"$y_k(t)$", fontsize=14)
+        plt.ylim([self.map_ymin, self.map_ymax])
+        plt.grid(True)
+        plt.plot(
+            t,
+            self.y,
+            color="mediumseagreen",
+            alpha=max(0.02, 1.0 / np.sqrt(self.seeds.size)),
+        )
+        self._plotline(t, self.y1, "indianred")
+
+        plt.subplot(212)
+        plt.title("Spread and divergence from the reference seed")
+        plt.xlabel("time t")
+        plt.grid(True)
+        plt.plot(t, self.spread(), color="royalblue", label="spread")
+        plt.plot(
+            t,
+            np.median(self.divergence(), axis=1),
+            color="indianred",
+            label="median divergence",
+        )
+        plt.axhline(
+            self.threshold,
+            color="black",
+            lw=1,
+            linestyle="--",
+            label="threshold"
+            + (
+                " (median crossing: t=%d)" % np.median(diverged)
+                if diverged.size
+                else ""
+            ),
+        )
+        plt.legend(loc="lower right")
+        plt.tight_layout()
+
+        return fig
 
 
 class Bifurcation(Map):
     """Class for plotting a Logistic/Cubic/Sine Bifurcation Diagram"""
 
-    def __init__(self, r, y, n=100, s=200, mapname="logistic"):
+    __slots__ = (
+        "rmin",
+        "rmax",
+        "ymin",
+        "ymax",
+        "n",
+        "s",
+        "jobs",
+        "chunk_size",
+        "columns",
+        "rows",
+        "tol",
+        "adaptive",
+        "_density",
+        "_plotlyapunov",
+    )
+
+    def __init__(self, r, y, n=100, s=200, mapname="logistic", jobs=1, chunk_size=None):
         Map.__init__(self, mapname)
 
         self.ensure(len(r) == 2, "The growth rate vector should contains two elements")
@@ -316,32 +1633,1053 @@ class Bifurcation(Map):
         self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
         self.s = s  # Number of iterations to skip in the plot
 
-    def plot(self):
+        self.ensure(jobs >= 0, "The number of jobs cannot be negative.")
+        self.jobs = jobs  # Number of worker processes (0: all the CPUs)
+
+        self.ensure(
+            chunk_size is None or chunk_size > 0,
+            "The chunk size must be greater than zero.",
+        )
+        self.chunk_size = chunk_size  # Number of r values computed at once
+
+        self.columns = 1000  # Number of r values in [rmin, rmax]
+        self.rows = 1000  # Number of y bins of the density raster
+        self.tol = None  # Tolerance for the early termination of the cycles
+        self.adaptive = False  # Refine the r values where the diagram changes
+
+        self._density = None
+        self._plotlyapunov = False
+
+    def fit(self, width, height):
+        """Set the number of columns (r values), of rows of the density
+        raster, and of retained iterations for a figure of width x height
+        pixels: one column and one row for each pixel of the plot area, and
+        as many iterations as its rows, so that a chaotic band gets on
+        average one state for each pixel"""
+
+        from matplotlib import rcParams
+
+        # the plot area, from the default margins of the subplots
+        width *= rcParams["figure.subplot.right"] - rcParams["figure.subplot.left"]
+        height *= rcParams["figure.subplot.top"] - rcParams["figure.subplot.bottom"]
+        if self.plotlyapunov:
+            height /= 2 + rcParams["figure.subplot.hspace"]
+
+        self.columns = max(1, int(width))
+        self.rows = self.n = max(1, int(height))
+
+    def budget(self):
+        """Return a dictionary describing the cost of the computation: the
+        number of 'columns', of retained 'samples' per column, of map
+        'evaluations', and the 'bytes' of final states kept in memory"""
+
+        columns = min(self.chunk_size or self.columns, self.columns)
+
+        return {
+            "columns": self.columns,
+            "samples": self.n + 1,
+            "evaluations": self.columns * (self.s + self.n),
+            "bytes": columns * (self.n + 1) * self.dtype.itemsize,
+        }
+
+    def getr(self):
+        """Return the numpy vector of the growth rates in [rmin, rmax]"""
+
+        return np.linspace(self.rmin, self.rmax, self.columns)
+
+    def getxy(self):
+        """Return the numpy vector 'r' of the growth rates and the matrix
+        of the corresponding final states (one column for each r)"""
+
+        if self.adaptive:
+            chunks = list(self.iterchunks())
+            r = np.concatenate([chunk[0] for chunk in chunks])
+            order = np.argsort(r)
+            return r[order], np.hstack([chunk[1] for chunk in chunks])[:, order]
+
+        r = self.getr()
+        return r, self.final_states(r, self.n, 0.5, self.s, self.jobs, self.tol)
+
+    def iterchunks(self):
+        """Iterate over the growth rates in chunks of (at most) 'chunk_size'
+        values, yielding the tuples (r, final states) of each chunk, so that
+        only one chunk at a time is kept in memory.
+        In 'adaptive' mode the r values are not sorted (see iteradaptive).
+        The same process pool computes all the chunks"""
+
+        with self._pooled(self.jobs):
+            if self.adaptive:
+                for chunk in self.iteradaptive():
+                    yield chunk
+                return
+
+            for chunk in self._chunks(self.getr()):
+                yield chunk
+
+    def _chunks(self, r):
+        """Compute the final states of the vector 'r' in chunks"""
+
+        chunk_size = self.chunk_size or r.size
+
+        for start in range(0, r.size, chunk_size):
+            chunk = r[start : start + chunk_size]
+            yield chunk, self.final_states(
+                chunk, self.n, 0.5, self.s, self.jobs, self.tol
+            )
+
+    def iteradaptive(self, coarse=None, threshold=0.01, maxperiod=32):
+        """Sample at most 'columns' r values, starting from a coarse grid and
+        recursively adding the midpoints between the neighbouring columns
+        whose attractors differ the most: in period (the number of distinct
+        final states, up to 'maxperiod'), or by more than 'threshold' (as a
+        fraction of [ymin, ymax]) in spread or mean value.
+        Yield the tuples (r, final states) of each refinement step"""
+
+        yrange = self.ymax - self.ymin
+        coarse = min(coarse or max(16, self.columns // 16), self.columns)
+
+        r = np.empty(0)
+        features = np.empty((3, 0))
+        new = np.linspace(self.rmin, self.rmax, coarse)
+
+        while new.size:
+            for chunk, states in self._chunks(new):
+                yield chunk, states
+
+                # the period of the cycles (0 for the chaotic orbits)
+                ordered = np.sort(states, axis=0)
+                period = 1 + np.count_nonzero(
+                    np.diff(ordered, axis=0) > 1e-6 * yrange, axis=0
+                )
+                period[period > maxperiod] = 0
+
+                r = np.append(r, chunk)
+                features = np.hstack(
+                    (
+                        features,
+                        [
+                            period,
+                            (ordered[-1] - ordered[0]) / yrange,
+                            states.mean(axis=0) / yrange,
+                        ],
+                    )
+                )
+
+            order = np.argsort(r)
+            r, features = r[order], features[:, order]
+
+            # score the intervals between the neighbouring columns
+            diff = np.abs(np.diff(features, axis=1))
+            score = np.where(diff[0] > 0, 1.0, np.maximum(diff[1], diff[2]))
+            score[np.diff(r) < 1e-12 * (self.rmax - self.rmin)] = 0
+
+            refine = np.nonzero(score > threshold)[0]
+            refine = refine[np.argsort(-score[refine], kind="stable")]
+            refine = np.sort(refine[: self.columns - r.size])
+
+            new = (r[refine] + r[refine + 1]) / 2.0
+
+    def getparams(self):
+        params = Map.getparams(self)
+        params.update(
+            r=[self.rmin, self.rmax],
+            y=[self.ymin, self.ymax],
+            x0=0.5,
+            n=self.n,
+            s=self.s,
+            columns=self.columns,
+            tol=self.tol,
+            adaptive=self.adaptive,
+        )
+        return params
+
+    def iterarrays(self):
+        """Yield, chunk by chunk, the arrays to be exported: the growth
+        rates 'r' and the matrix 'states' having in each row the final
+        states of the corresponding r (not sorted in 'adaptive' mode)"""
+
+        for r, states in self.iterchunks():
+            yield {"r": r, "states": states.T}
+
+    def gethistogram(self, ybins=None, rbins=None):
+        """Return a (ybins, rbins) matrix counting the final states falling in
+        each bin of [ymin, ymax] x [rmin, rmax] (ybins and rbins default to
+        the number of rows and columns). The histogram is accumulated one
+        chunk at a time"""
+
+        ybins = ybins or self.rows
+        rbins = rbins or self.columns
+        counts = np.zeros((ybins, rbins))
+
+        for r, states in self.iterchunks():
+            self._histogram(counts, r, states)
+
+        return counts
+
+    def _histogram(self, counts, r, states):
+        """Add to the (ybins, rbins) matrix 'counts' the 2D histogram of a
+        chunk of final states, binned as by numpy.histogram2d but only over
+        the columns covered by the chunk"""
+
+        ybins, rbins = counts.shape
+        rows = _bins(states, self.ymin, self.ymax, ybins)
+        columns = np.broadcast_to(_bins(r, self.rmin, self.rmax, rbins), states.shape)
+        valid = (rows >= 0) & (columns >= 0)
+        if not np.any(valid):
+            return
+
+        rows, columns = rows[valid], columns[valid]
+        first = columns.min()
+        width = columns.max() - first + 1
+        counts[:, first : first + width] += np.bincount(
+            rows * width + columns - first, minlength=ybins * width
+        ).reshape(ybins, width)
+
+    def getlyapunov(self):
+        """Return the numpy vector 'r' of the growth rates and the vector of
+        the Lyapunov exponents estimated along the computed final states"""
+
+        r, exponents = [], []
+        for chunk, states in self.iterchunks():
+            r.append(chunk)
+            exponents.append(self.exponents(chunk, states))
+
+        r = np.concatenate(r)
+        order = np.argsort(r)
+        return r[order], np.concatenate(exponents)[order]
+
+    def figure(self):
+        """Build and return the figure of a Bifurcation Diagram, followed by
+        the plot of the Lyapunov exponents if 'plotlyapunov' is set.
+        Only the density raster keeps one chunk of final states at a time
+        in memory: the scatter plot holds a copy of all of them"""
+
+        plt = _pyplot()
+
+        fig = plt.figure()
         plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
+
+        if self.plotlyapunov:
+            plt.subplot(211)
         plt.title("Bifurcation Diagram for the " + self.map_longname)
 
         plt.xlim([self.rmin, self.rmax])
         plt.xticks([round(i, 1) for i in np.linspace(self.rmin, self.rmax, 5)])
-        plt.xlabel("r")
+        if not self.plotlyapunov:
+            plt.xlabel("r")
 
         plt.ylim([self.ymin, self.ymax])
         plt.ylabel("final states")
 
-        for r in np.linspace(self.rmin, self.rmax, 1000):
-            x, y = FinalState(r, self.n, 0.5, self.s, self.map_name).getxy(r)
+        ybins = self.rows
+        counts = np.zeros((ybins, self.columns))
+        samples = np.zeros(self.columns)
+        rvalues, exponents = [], []
+
+        # the final states are computed only once, chunk by chunk
+        for r, states in self.iterchunks():
+            if self.plotlyapunov:
+                rvalues.append(r)
+                exponents.append(self.exponents(r, states))
+            if self.density:
+                self._histogram(counts, r, states)
+                samples += np.histogram(
+                    r, bins=self.columns, range=[self.rmin, self.rmax]
+                )[0]
+            else:
+                plt.plot(
+                    np.broadcast_to(r, states.shape).ravel(),
+                    states.ravel(),
+                    color="black",
+                    linestyle="",
+                    markerfacecolor="black",
+                    marker=",",
+                    markersize=1,
+                )
+
+        if self.density:
+            from matplotlib.colors import LogNorm
+
+            if self.adaptive:
+                # normalize the columns sampled more than once and fill
+                # the columns not sampled with the next sampled one
+                sampled = np.nonzero(samples)[0]
+                counts = counts[:, sampled] / samples[sampled]
+                nearest = np.clip(
+                    np.searchsorted(sampled, np.arange(self.columns)),
+                    0,
+                    sampled.size - 1,
+                )
+                counts = counts[:, nearest]
+
+            plt.imshow(
+                counts,
+                origin="lower",
+                extent=[self.rmin, self.rmax, self.ymin, self.ymax],
+                aspect="auto",
+                interpolation="nearest",
+                cmap="Greys",
+                norm=LogNorm(vmin=1) if self.density == "log" else None,
+            )
+
+        if self.plotlyapunov:
+            plt.subplot(212)
+            plt.title("Lyapunov Exponents")
+            plt.xlim([self.rmin, self.rmax])
+            plt.xlabel("r")
+            plt.ylabel(r"$\lambda$", fontsize=14)
+            plt.grid(True)
+            plt.axhline(0, color="black", lw=1)
+            r = np.concatenate(rvalues)
+            order = np.argsort(r)
             plt.plot(
-                y[self.s :],
-                x[self.s :],
-                color="black",
-                linestyle="",
-                markerfacecolor="black",
-                marker=",",
-                markersize=1,
+                r[order], np.concatenate(exponents)[order], color="royalblue", lw=1
             )
+            fig.tight_layout()
+
+        return fig
+
+    @property
+    def density(self):
+        return self._density
+
+    @density.setter
+    def density(self, value):
+        """Set whether to plot the diagram as a density raster with a
+        'linear' or 'log' shading, or as a scatter plot (None)"""
+        self.ensure(
+            value in (None, "linear", "log"),
+            "The density shading must be either 'linear' or 'log'",
+        )
+        self._density = value
+
+    @property
+    def plotlyapunov(self):
+        return self._plotlyapunov
+
+    @plotlyapunov.setter
+    def plotlyapunov(self, value):
+        """Set whether to plot the Lyapunov exponents below the diagram"""
+        self._plotlyapunov = value
+
+
+class BifurcationExplorer(object):
+    """Class for exploring a Bifurcation Diagram in an interactive window:
+    after each zoom or pan, the visible r/y window is recomputed at the
+    screen resolution, first with a coarse pass and then with a full one.
+    The final states are computed in tiles of 'tilesize' r values aligned
+    on a grid, and the 'maxtiles' most recently used tiles are kept in
+    memory, so that going back to a window already seen is instant"""
+
+    def __init__(self, bifurcation, tilesize=64, maxtiles=256):
+        self.bd = bifurcation
+        self.tilesize = tilesize
+        self.maxtiles = maxtiles
+
+        self.tiles = collections.OrderedDict()
+        self.computed = 0  # Number of tiles computed so far
+
+        self.axes = self.image = None
+        self._timer = None
+
+    def _gettiles(self, level, indexes):
+        """Return the tiles (r, final states) with the given indexes and
+        r step 2**level, computing at once all the ones not in memory"""
+
+        bd = self.bd
+        step = 2.0**level
+        missing = [i for i in indexes if (level, i) not in self.tiles]
+
+        if missing:
+            r = (
+                np.asarray(missing)[:, None] * self.tilesize + np.arange(self.tilesize)
+            ) * step
+            valid = (r >= bd.map_rmin) & (r <= bd.map_rmax)
+            states = bd.final_states(r[valid], bd.n, 0.5, bd.s, bd.jobs, bd.tol)
+
+            start = 0
+            for index, tile, mask in zip(missing, r, valid):
+                end = start + np.count_nonzero(mask)
+                self.tiles[(level, index)] = (tile[mask], states[:, start:end])
+                self.computed += 1
+                start = end
+
+        tiles = []
+        for index in indexes:
+            self.tiles.move_to_end((level, index))
+            tiles.append(self.tiles[(level, index)])
+
+        while len(self.tiles) > self.maxtiles:
+            self.tiles.popitem(last=False)
+
+        return tiles
+
+    def raster(self, rmin, rmax, ymin, ymax, columns, rows):
+        """Return a (rows, columns) matrix counting the final states in each
+        bin of the window [rmin, rmax] x [ymin, ymax]"""
+
+        # the step of the tiles is the power of 2 not greater than a column
+        level = int(np.floor(np.log2((rmax - rmin) / columns)))
+        span = self.tilesize * 2.0**level
+        indexes = range(int(np.floor(rmin / span)), int(np.floor(rmax / span)) + 1)
+
+        counts = np.zeros((rows, columns))
+        for r, states in self._gettiles(level, indexes):
+            counts += np.histogram2d(
+                states.ravel(),
+                np.broadcast_to(r, states.shape).ravel(),
+                bins=(rows, columns),
+                range=[[ymin, ymax], [rmin, rmax]],
+            )[0]
+
+        return counts
+
+    def update(self, reduction=1):
+        """Recompute the visible window with one column (and row) for each
+        'reduction' pixels of the axes"""
+
+        bd = self.bd
+        rmin, rmax = np.clip(self.axes.get_xlim(), bd.map_rmin, bd.map_rmax)
+        ymin, ymax = self.axes.get_ylim()
+        if rmax <= rmin or ymax <= ymin:
+            return
+
+        bbox = self.axes.get_window_extent()
+        columns = max(1, int(bbox.width) // reduction)
+        rows = max(1, int(bbox.height) // reduction)
+
+        counts = self.raster(rmin, rmax, ymin, ymax, columns, rows)
+        self.image.set_data(counts)
+        self.image.set_extent([rmin, rmax, ymin, ymax])
+        self.image.set_clim(1 if bd.density != "linear" else 0, max(counts.max(), 1))
+        self.axes.figure.canvas.draw_idle()
+
+    def _schedule(self, callback):
+        """Run 'callback' soon, cancelling the pending one (if any)"""
+
+        if self._timer is not None:
+            self._timer.stop()
+        self._timer = self.axes.figure.canvas.new_timer(interval=50)
+        self._timer.single_shot = True
+        self._timer.add_callback(callback)
+        self._timer.start()
+
+    def _coarse_pass(self):
+        self.update(4)
+        self._schedule(self.update)
+
+    def _on_limits_changed(self, axes):
+        self._schedule(self._coarse_pass)
+
+    def figure(self):
+        """Build and return the figure of the interactive Bifurcation Diagram"""
+
+        plt = _pyplot()
+        from matplotlib.colors import LogNorm
+
+        bd = self.bd
+
+        fig = plt.figure()
+        plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
+        plt.title("Bifurcation Diagram for the " + bd.map_longname)
+        plt.xlabel("r")
+        plt.ylabel("final states")
+
+        self.axes = plt.gca()
+        self.image = plt.imshow(
+            np.zeros((1, 1)),
+            origin="lower",
+            extent=[bd.rmin, bd.rmax, bd.ymin, bd.ymax],
+            aspect="auto",
+            interpolation="nearest",
+            cmap="Greys",
+            norm=None if bd.density == "linear" else LogNorm(vmin=1),
+        )
+        self.axes.set_xlim([bd.rmin, bd.rmax])
+        self.axes.set_ylim([bd.ymin, bd.ymax])
+        self.axes.set_autoscale_on(False)
+
+        self.update()
+
+        self.axes.callbacks.connect("xlim_changed", self._on_limits_changed)
+        self.axes.callbacks.connect("ylim_changed", self._on_limits_changed)
 
+        return fig
+
+    def plot(self):
+        """Explore the Bifurcation Diagram in an interactive window"""
+
+        plt = _pyplot()
+
+        self.figure()
         plt.show()
 
 
+class ParameterPlane(Map):
+    """Class for plotting the attractors of a Logistic/Cubic/Sine Map in the
+    plane of the growth rate r and of the initial condition x0"""
+
+    __slots__ = (
+        "rmin",
+        "rmax",
+        "x0min",
+        "x0max",
+        "n",
+        "s",
+        "jobs",
+        "chunk_size",
+        "columns",
+        "rows",
+        "tol",
+        "maxperiod",
+        "_labels",
+    )
+
+    def __init__(
+        self, r, x0, n=100, s=1000, mapname="logistic", jobs=1, chunk_size=None
+    ):
+        Map.__init__(self, mapname)
+
+        self.ensure(len(r) == 2, "The growth rate vector should contains two elements")
+        self.ensure(
+            r[0] >= self.map_rmin and r[0] < r[1] and r[1] <= self.map_rmax,
+            (
+                "The parameters [r0, r1] must be between %g and %g, "
+                "and in ascending order."
+            ),
+            self.map_rmin,
+            self.map_rmax,
+        )
+        self.ensure(len(x0) == 2, "The x0 range vector should contains two elements")
+        self.ensure(
+            x0[0] >= self.map_ymin and x0[0] < x0[1] and x0[1] <= self.map_ymax,
+            (
+                "The initial conditions [x0, x1] must be between %g and %g, "
+                "and in ascending order."
+            ),
+            self.map_ymin,
+            self.map_ymax,
+        )
+
+        self.rmin = r[0]  # Range of the growth rate
+        self.rmax = r[1]
+        self.x0min = x0[0]  # Range of the initial conditions
+        self.x0max = x0[1]
+
+        self.ensure(n > 0, "The number of iterations must be greater than zero.")
+        self.n = n  # Number of iterations for the Lyapunov exponents
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+        self.s = s  # Number of iterations for reaching the attractors
+
+        self.ensure(jobs >= 0, "The number of jobs cannot be negative.")
+        self.jobs = jobs  # Number of worker processes (0: all the CPUs)
+        self.chunk_size = chunk_size  # Number of (r, x0) pairs computed at once
+
+        self.columns = 400  # Number of r values in [rmin, rmax]
+        self.rows = 300  # Number of x0 values in [x0min, x0max]
+        self.tol = 1e-9  # Tolerance for detecting the cycles
+        self.maxperiod = 32  # Longest period detected
+
+        self._labels = None
+
+    def getr(self):
+        """Return the numpy vector of the growth rates in [rmin, rmax]"""
+
+        return np.linspace(self.rmin, self.rmax, self.columns)
+
+    def getx0(self):
+        """Return the numpy vector of the initial conditions in [x0min, x0max]"""
+
+        return np.linspace(self.x0min, self.x0max, self.rows)
+
+    def getlabels(self):
+        """Return the (rows, columns) matrix of the labels of the attractors
+        (see Map.scan), computing it only once"""
+
+        if self._labels is None:
+            r, x0 = self.getr(), self.getx0()
+            self._labels = self._cached(
+                lambda: self.scan(
+                    r,
+                    x0,
+                    self.n,
+                    self.s,
+                    self.tol,
+                    self.maxperiod,
+                    self.jobs,
+                    self.chunk_size,
+                ),
+                r,
+                x0,
+                self.n,
+                self.s,
+                tol=self.tol,
+                maxperiod=self.maxperiod,
+                scan=True,
+            )
+
+        return self._labels
+
+    def summary(self):
+        """Return a dictionary with the fraction of the (r, x0) pairs with
+        each label, and the fraction of the growth rates having more than
+        one attractor (as distinguished by the labels)"""
+
+        labels = self.getlabels()
+        values, counts = np.unique(labels, return_counts=True)
+        fractions = counts / float(labels.size)
+
+        ordered = np.sort(labels, axis=0)
+        multistable = np.any(ordered[1:] != ordered[:-1], axis=0)
+
+        return {
+            "escaped": float(fractions[values == ESCAPED].sum()),
+            "chaotic": float(fractions[values == CHAOTIC].sum()),
+            "unresolved": float(fractions[values == UNRESOLVED].sum()),
+            "periods": dict(
+                (int(value), float(fraction))
+                for value, fraction in zip(values, fractions)
+                if value > 0
+            ),
+            "multistable": float(multistable.mean()),
+        }
+
+    def getparams(self):
+        params = Map.getparams(self)
+        params.update(
+            r=[self.rmin, self.rmax],
+            x0=[self.x0min, self.x0max],
+            n=self.n,
+            s=self.s,
+            columns=self.columns,
+            rows=self.rows,
+            tol=self.tol,
+            maxperiod=self.maxperiod,
+        )
+        return params
+
+    def iterarrays(self):
+        """Yield the arrays to be exported: the initial conditions 'x0' and
+        the (rows, columns) matrix of the 'labels', having in each row the
+        labels of the growth rates linspace(r[0], r[1], columns)"""
+
+        yield {"x0": self.getx0(), "labels": self.getlabels()}
+
+    @staticmethod
+    def labelname(label):
+        """Return the description of an attractor label"""
+
+        return {
+            ESCAPED: "escaped",
+            CHAOTIC: "chaotic",
+            UNRESOLVED: "unresolved",
+            1: "fixed point",
+        }.get(label, "period %d" % label)
+
+    def figure(self):
+        """Build and return the figure of the attractors in the (r, x0) plane"""
+
+        plt = _pyplot()
+        from matplotlib.colors import BoundaryNorm, ListedColormap
+
+        labels = self.getlabels()
+
+        fig = plt.figure()
+        plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
+        plt.title("Attractors of the " + self.map_longname)
+        plt.xlabel("r")
+        plt.ylabel("initial condition $x_0$")
+
+        # one color for each label found, in increasing order
+        values = np.unique(labels)
+        special = {ESCAPED: "black", CHAOTIC: "dimgray", UNRESOLVED: "white"}
+        palette = plt.get_cmap("tab20").colors
+        colors = [
+            special.get(value, palette[(value - 1) % len(palette)]) for value in values
+        ]
+
+        image = plt.imshow(
+            np.searchsorted(values, labels),
+            origin="lower",
+            extent=[self.rmin, self.rmax, self.x0min, self.x0max],
+            aspect="auto",
+            interpolation="nearest",
+            cmap=ListedColormap(colors),
+            norm=BoundaryNorm(np.arange(values.size + 1) - 0.5, values.size),
+        )
+        colorbar = plt.colorbar(image, ticks=np.arange(values.size))
+        colorbar.ax.set_yticklabels([self.labelname(value) for value in values])
+
+        return fig
+
+
+class VectorMap(Map):
+    """Class that provides the maps of a vector state with one or more
+    parameters (see VECTOR_MAPS). The orbits are iterated in batches: the
+    parameters and the components of the initial states can be vectors,
+    and all the resulting orbits are iterated at once by numpy.
+    The methods of Map specific to the maps of one variable (converged_states,
+    scan, lyapunov, and exponents) are not available"""
+
+    __slots__ = ("map_parameters", "map_defaults", "map_variables", "map_ranges")
+
+    def __init__(self, mapname="henon"):
+        self.map_name = mapname
+
+        try:
+            (
+                self.map_longname,
+                self.map_parameters,
+                self.map_defaults,
+                self.map_variables,
+                self.map_ranges,
+                self.map_function,
+            ) = VECTOR_MAPS[mapname]
+            self.map = self._mapper
+        except Exception as e:
+            raise type(e)("Unknown map name " + mapname)
+
+        self.map_derivative = None
+        self.map_source = None
+        self._backend = "numpy"  # the numba kernels only iterate scalar states
+        self._precision = "float64"
+        self._pool = None  # The process pool kept open by _pooled()
+        self.cache = None  # An optional lecache.Cache object
+        self.profiler = None  # An optional leprofile.Profiler object
+
+    def _mapper(self, params, state):
+        if self.profiler is not None:
+            self.profiler.count(np.broadcast(*(list(params) + list(state))).size)
+        return self.map_function(params, state)
+
+    def _getparams(self, params):
+        """Return the list of the parameters (the default ones if None)"""
+
+        if params is None:
+            params = self.map_defaults
+        self.ensure(
+            len(params) == len(self.map_parameters),
+            "The %s has the parameters: %s",
+            self.map_longname,
+            ", ".join(self.map_parameters),
+        )
+        return [np.asarray(p, dtype=self.dtype) for p in params]
+
+    def _getstate(self, x0):
+        """Return the list of the components of the initial state (the
+        centre of the plot ranges if None)"""
+
+        if x0 is None:
+            x0 = [(low + high) / 2.0 for low, high in self.map_ranges]
+        self.ensure(
+            len(x0) == len(self.map_variables),
+            "The state of the %s has the components: %s",
+            self.map_longname,
+            ", ".join(self.map_variables),
+        )
+        return [np.asarray(x, dtype=self.dtype) for x in x0]
+
+    def _iterate(self, params, x0, n, s=0):
+        """Iterate the map and return a (n+1, components, ...) array with the
+        n+1 states following the first 's' (not stored) iterations"""
+
+        params = self._getparams(params)
+        state = self._getstate(x0)
+        shape = np.broadcast(*(params + state)).shape
+        self._count(np.prod(shape) * (n + s))
+
+        states = np.empty((n + 1, len(state)) + shape, dtype=self.dtype)
+
+        # the orbits escaping to infinity end up with NaN states
+        with np.errstate(over="ignore", invalid="ignore"):
+            for _ in range(s):
+                state = self.map_function(params, state)
+            for i, x in enumerate(state):
+                states[0, i] = x
+            for t in range(1, n + 1):
+                state = self.map_function(params, state)
+                for i, x in enumerate(state):
+                    states[t, i] = x
+
+        return states
+
+    def orbit(self, params=None, x0=None, n=100, s=0):
+        """Return a numpy array containing the n+1 states of the orbit
+        starting from x0 (a sequence with the components of the state),
+        following the first 's' iterations (which are not stored): the
+        components of each state are in the second axis. When some of the
+        parameters or of the components of x0 are vectors, all the orbits
+        are iterated at once and stored along the following axes"""
+
+        self.ensure(n >= 0, "The number of iterations cannot be negative.")
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+
+        return self._cached(
+            lambda: self._iterate(params, x0, n, s), params, x0, n, s, vector=True
+        )
+
+    def final_states(self, params, n, x0=None, s=0, jobs=1):
+        """Iterate the map for all the values of the parameters at once (some
+        of them being vectors of the same length m, for a parameter sweep)
+        and return a (n+1, components, m) numpy array containing the final
+        states left after skipping the first 's' iterations. When 'jobs'
+        is greater than one (or zero, meaning all the available CPUs) the
+        parameters are split in shards computed by a process pool"""
+
+        params = self._getparams(params)
+        state = self._getstate(x0)
+        self.ensure(
+            np.broadcast(*(params + state)).ndim == 1,
+            "The parameters and x0 must be scalars or vectors.",
+        )
+        self.ensure(n >= 0, "The number of iterations cannot be negative.")
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+        self.ensure(jobs >= 0, "The number of jobs cannot be negative.")
+
+        return self._cached(
+            lambda: self._parallel(params, state, n, s, jobs),
+            params,
+            state,
+            n,
+            s,
+            vector=True,
+        )
+
+    def _parallel(self, params, x0, n, s, jobs):
+        """Iterate the map with 'jobs' worker processes, each of them
+        computing the final states of a shard of the parameters"""
+
+        columns = np.broadcast_arrays(*(params + x0))
+        jobs = min(jobs or multiprocessing.cpu_count(), columns[0].size)
+        if jobs <= 1:
+            return self._iterate(params, x0, n, s)
+
+        k = len(params)
+        shards = [
+            (self.map_name, self._precision, shard[:k], shard[k:], n, s)
+            for shard in zip(*(np.array_split(c, jobs) for c in columns))
+        ]
+        with self._pooled(jobs):
+            results = self._pool.map(_vector_states_shard, shards)
+
+        self._count(sum(result[1] for result in results))
+        return np.concatenate([result[0] for result in results], axis=2)
+
+
+class Attractor(VectorMap):
+    """Class for plotting the attractor of a map of two variables (or the
+    phase portrait of the Standard Map) as a density raster: the orbits of
+    'seeds' random initial states are iterated at once, and the n states
+    following the first 's' iterations of each orbit are accumulated chunk
+    by chunk in a histogram with one bin for each pixel of the plot"""
+
+    __slots__ = (
+        "params",
+        "xmin",
+        "xmax",
+        "ymin",
+        "ymax",
+        "n",
+        "s",
+        "seeds",
+        "chunk_size",
+        "columns",
+        "rows",
+        "_density",
+    )
+
+    def __init__(
+        self,
+        params=None,
+        x=None,
+        y=None,
+        n=1000,
+        s=100,
+        mapname="henon",
+        seeds=10000,
+        chunk_size=None,
+    ):
+        VectorMap.__init__(self, mapname)
+
+        self.ensure(
+            len(self.map_variables) == 2,
+            "The attractor of the %s cannot be plotted",
+            self.map_longname,
+        )
+        self.params = [float(p) for p in self._getparams(params)]
+
+        for name, window in (("x", x), ("y", y)):
+            self.ensure(
+                window is None or (len(window) == 2 and window[0] < window[1]),
+                "The %s range should contains two elements in ascending order",
+                name,
+            )
+        # Plot window
+        self.xmin, self.xmax = x or self.map_ranges[0]
+        self.ymin, self.ymax = y or self.map_ranges[1]
+
+        self.ensure(n > 0, "The number of iterations must be greater than zero.")
+        self.n = n  # Number of iterations of each orbit
+        self.ensure(s >= 0, "You cannot skip a negative number of iterations.")
+        self.s = s  # Number of iterations to skip in the plot
+        self.ensure(seeds > 0, "The number of seeds must be greater than zero.")
+        self.seeds = seeds  # Number of orbits iterated at once
+        self.ensure(
+            chunk_size is None or chunk_size > 0,
+            "The chunk size must be greater than zero.",
+        )
+        self.chunk_size = chunk_size  # Number of iterations computed at once
+
+        self.columns = 1000  # Number of x bins of the density raster
+        self.rows = 1000  # Number of y bins of the density raster
+
+        self._density = "log"
+
+    def fit(self, width, height):
+        """Set the number of columns and rows of the density raster for
+        a figure of width x height pixels (one bin for each pixel)"""
+
+        from matplotlib import rcParams
+
+        width *= rcParams["figure.subplot.right"] - rcParams["figure.subplot.left"]
+        height *= rcParams["figure.subplot.top"] - rcParams["figure.subplot.bottom"]
+
+        self.columns = max(1, int(width))
+        self.rows = max(1, int(height))
+
+    def iterchunks(self):
+        """Yield, chunk by chunk, (iterations, 2, orbits) arrays with the
+        states of the orbits following the first 's' iterations. The seeds
+        are drawn uniformly (and reproducibly) in the ranges of the map, and
+        the orbits escaped to infinity during the transient are dropped"""
+
+        random = np.random.RandomState(0)
+        state = [random.uniform(low, high, self.seeds) for low, high in self.map_ranges]
+        state = self._iterate(self.params, state, 0, self.s)[0]
+        state = state[:, np.all(np.isfinite(state), axis=0)]
+
+        # about 1 MiB of states for each component
+        steps = self.chunk_size or max(1, (1 << 17) // max(1, state.shape[1]))
+        for start in range(0, self.n, steps):
+            states = self._iterate(self.params, state, min(steps, self.n - start))
+            state = states[-1]
+            yield states[1:]
+
+    def gethistogram(self):
+        """Return the (rows, columns) matrix counting the states falling in
+        each bin of [xmin, xmax] x [ymin, ymax]"""
+
+        return self._cached(
+            self._accumulate,
+            self.params,
+            self.seeds,
+            self.n,
+            self.s,
+            window=[self.xmin, self.xmax, self.ymin, self.ymax],
+            columns=self.columns,
+            rows=self.rows,
+        )
+
+    def _accumulate(self):
+        counts = np.zeros(self.rows * self.columns, dtype=np.int64)
+        for states in self.iterchunks():
+            counts += self._histogram(states)
+
+        return counts.reshape(self.rows, self.columns)
+
+    def _histogram(self, states):
+        """Return the flattened 2D histogram of a chunk of states, binned
+        directly from their coordinates (faster than numpy.histogram2d)"""
+
+        xscale = self.columns / (self.xmax - self.xmin)
+        yscale = self.rows / (self.ymax - self.ymin)
+
+        # the NaN and infinite states of the escaping orbits are not inside
+        with np.errstate(over="ignore", invalid="ignore"):
+            column = (states[:, 0] - self.xmin) * xscale
+            row = (states[:, 1] - self.ymin) * yscale
+            inside = (column >= 0) & (column < self.columns)
+            inside &= (row >= 0) & (row < self.rows)
+        row, column = row[inside].astype(np.intp), column[inside].astype(np.intp)
+
+        return np.bincount(
+            row * self.columns + column, minlength=self.rows * self.columns
+        )
+
+    def getparams(self):
+        params = Map.getparams(self)
+        params.update(
+            params=self.params,
+            x=[self.xmin, self.xmax],
+            y=[self.ymin, self.ymax],
+            n=self.n,
+            s=self.s,
+            seeds=self.seeds,
+            columns=self.columns,
+            rows=self.rows,
+        )
+        return params
+
+    def iterarrays(self):
+        """Yield, chunk by chunk, the arrays to be exported: one for each
+        component of the state, with the finite states of the orbits"""
+
+        for states in self.iterchunks():
+            finite = np.all(np.isfinite(states), axis=1)
+            yield dict(
+                (name, states[:, i][finite])
+                for i, name in enumerate(self.map_variables)
+            )
+
+    def figure(self):
+        """Build and return the figure of the attractor"""
+
+        plt = _pyplot()
+        from matplotlib.colors import LogNorm
+
+        counts = self.gethistogram()
+
+        fig = plt.figure()
+        plt.suptitle("Dynamic Systems and Chaos", fontsize=14, fontweight="bold")
+        plt.title(
+            "%s (%s)"
+            % (
+                self.map_longname,
+                ", ".join(
+                    "%s=%g" % item for item in zip(self.map_parameters, self.params)
+                ),
+            )
+        )
+        plt.xlabel(self.map_variables[0])
+        plt.ylabel(self.map_variables[1])
+
+        plt.imshow(
+            counts,
+            origin="lower",
+            extent=[self.xmin, self.xmax, self.ymin, self.ymax],
+            aspect="auto",
+            interpolation="nearest",
+            cmap="Greys",
+            norm=LogNorm(vmin=1) if self.density == "log" and counts.any() else None,
+        )
+
+        return fig
+
+    @property
+    def density(self):
+        return self._density
+
+    @density.setter
+    def density(self, value):
+        """Set whether to shade the density raster on a 'linear' or
+        'log' scale"""
+        self.ensure(
+            value in ("linear", "log"),
+            "The density shading must be either 'linear' or 'log'",
+        )
+        self._density = value
+
+
 if __name__ == "__main__":
     from lelib_test import tests
 
@@ -5,9 +5,53 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from __future__ import print_function
+import os
+import subprocess
+import sys
+import tempfile
+
+import matplotlib.pyplot as plt
 import numpy as np
 
-from lelib import Map, Logistic, LogisticDiff
+from lelib import (
+    _jit_orbit,
+    CHAOTIC,
+    MAPS,
+    PRECISIONS,
+    define_map,
+    load_maps,
+    Map,
+    Logistic,
+    LogisticDiff,
+    LogisticEnsemble,
+    FinalState,
+    Bifurcation,
+    BifurcationExplorer,
+    ParameterPlane,
+    VectorMap,
+    Attractor,
+)
+
+
+def test_import():
+    """Test that importing lelib does not load the plotting libraries"""
+
+    print("Running the tests for the import of the module 'lelib'...")
+
+    modules = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, lelib; print(' '.join(sys.modules))",
+        ],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).split()
+
+    for module in (b"matplotlib", b"matplotlib.pyplot", b"numba"):
+        Map.ensure(
+            module not in modules,
+            "'import lelib' should not import %s" % module.decode(),
+        )
 
 
 def test_class_map():
@@ -40,6 +84,336 @@ def test_class_map():
     m.ensure(i == 0.5, "Sine Map: bad value for r=0.5 and x=1: should be %f" % i)
 
 
+def test_map_orbit():
+    """Test the array-native orbits of the class 'Map'"""
+
+    print("Running the tests for the orbits of the class 'Map'...")
+
+    for mapname, r, x0 in (
+        ("logistic", 3.7, 0.3),
+        ("cubic", 6.2, 0.8),
+        ("sine", 1.8, 0.4),
+    ):
+        m = Map(mapname)
+        y = m.orbit(r, x0, 30)
+        m.ensure(len(y) == 31, "%s Map: the orbit should have 31 states" % mapname)
+
+        x = x0
+        for t in range(1, 31):
+            x = m.map(r, x)
+            m.ensure(abs(y[t] - x) < 1e-9, "%s Map: bad orbit at t=%d" % (mapname, t))
+
+        y = m.orbit(np.array([r, r / 2.0]), x0, 30)
+        m.ensure(y.shape == (31, 2), "%s Map: bad shape for a batch" % mapname)
+
+    try:
+        Map().orbit(np.array([3.0, 4.5]), 0.5, 10)
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("Logistic Map: r out of range has not been detected")
+
+
+def test_map_backends():
+    """Test that the available backends give the same orbits"""
+
+    print("Running the tests for the backends of the class 'Map'...")
+
+    for mapname, rrange in (
+        ("logistic", [3, 4]),
+        ("cubic", [5, 6.5]),
+        ("sine", [1, 2]),
+    ):
+        m = Map(mapname)
+        m.ensure(m.backend == "auto", "The default backend should be 'auto'")
+        m.ensure(
+            m._jit(_jit_orbit, 1000, 1000) is None,
+            "The 'auto' backend should not compile the small batches",
+        )
+        m.ensure(
+            (m._jit(_jit_orbit, 1, 10**6) is None)
+            == (_jit_orbit(m.map_function) is None),
+            "The 'auto' backend should compile the long orbits",
+        )
+
+        m.backend = "numpy"
+        r = np.linspace(rrange[0], rrange[1], 100)
+        y = m.final_states(r, 40, 0.5, 20)
+
+        if _jit_orbit(m.map_function) is None:
+            continue
+
+        m.backend = "numba"
+        m.ensure(
+            np.allclose(m.final_states(r, 40, 0.5, 20), y, rtol=0, atol=1e-9),
+            "%s Map: the numba and numpy backends differ" % mapname,
+        )
+        m.ensure(
+            np.allclose(m.orbit(rrange[1], 0.5, 60)[20:], y[:, -1], atol=1e-9),
+            "%s Map: bad orbit with the numba backend" % mapname,
+        )
+
+
+def test_map_lyapunov():
+    """Test the Lyapunov exponents computed by the class 'Map'"""
+
+    print("Running the tests for the Lyapunov exponents of the class 'Map'...")
+
+    m = Map()
+    exps = m.lyapunov([2.9, 3.2, 4.0], 20000, 0.3, 100)
+    m.ensure(exps[0] < 0 and exps[1] < 0, "Logistic Map: the orbits should be stable")
+    m.ensure(abs(exps[2] - np.log(2)) < 1e-2, "Logistic Map: lambda(4) should be ln 2")
+
+    for mapname, rrange in (
+        ("logistic", [3, 4]),
+        ("cubic", [5, 6.5]),
+        ("sine", [1, 2]),
+    ):
+        m = Map(mapname)
+        r = np.linspace(rrange[0], rrange[1], 50)
+
+        # analytic derivatives vs finite differences
+        x = np.linspace(0.1, 0.9, 50)
+        h = 1e-6
+        numeric = (m.map_function(r, x + h) - m.map_function(r, x - h)) / (2 * h)
+        m.ensure(
+            np.allclose(m.map_derivative(r, x), numeric, atol=1e-6),
+            "%s Map: bad derivative" % mapname,
+        )
+
+        m.ensure(
+            np.allclose(
+                m.lyapunov(r, 200, 0.5, 100),
+                m.exponents(r, m.final_states(r, 200, 0.5, 100)),
+            ),
+            "%s Map: the exponents of the stored orbits differ" % mapname,
+        )
+
+
+def test_map_precision():
+    """Test the floating point types selectable for the orbits"""
+
+    print("Running the tests for the precision of the orbits...")
+
+    orbits = {}
+    for precision in PRECISIONS:
+        m = Map()
+        m.precision = precision
+        orbits[precision] = m.orbit(4.0, 0.2, 100)
+        m.ensure(
+            orbits[precision].dtype == PRECISIONS[precision],
+            "The orbits should be computed in %s",
+            precision,
+        )
+
+        bd = Bifurcation([2.8, 3.2], [0, 1], 20, 500)
+        bd.precision = precision
+        _, states = bd.getxy()
+        m.ensure(states.dtype == PRECISIONS[precision], "Bad dtype of the states")
+        m.ensure(
+            np.allclose(
+                states[:, -1], [0.513045, 0.799455] * 10 + [0.513045], atol=1e-5
+            ),
+            "The stable cycles should not depend on the precision",
+        )
+
+    diverged = np.abs(orbits["float32"] - orbits["float64"]) > 0.1
+    m.ensure(diverged[:10].sum() == 0, "The float32 orbit should start accurate")
+    m.ensure(diverged.any(), "The float32 orbit should diverge at r=4")
+
+    try:
+        m.precision = "float16"
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("An unknown precision should not be accepted")
+
+
+def test_define_map():
+    """Test the user maps compiled from expressions"""
+
+    print("Running the tests for the user maps...")
+
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, "maps.ini")
+    with open(filename, "w") as f:
+        f.write(
+            "[quadratic]\nexpression = r*x*(1-x)**2\nr = 0:6.75\ny = 0:1\n"
+            "[tent]\nexpression = r*minimum(x, 1 - x)\nr = 0:2\ny = 0:1\n"
+        )
+
+    try:
+        m = Map()
+        m.ensure(load_maps(filename) == ["quadratic", "tent"], "Bad user maps")
+
+        quadratic = Map("quadratic")
+        r = np.linspace(5, 6.5, 7)
+        states = quadratic.orbit(r, 0.2, 50)
+        x = np.full(r.size, 0.2)
+        for _ in range(50):
+            x = r * x * (1 - x) ** 2
+        m.ensure(np.allclose(states[-1], x), "Bad orbits of the user map")
+        m.ensure(
+            np.allclose(
+                quadratic.map_derivative(r, x), r * (1 - x) * (1 - 3 * x), atol=1e-12
+            ),
+            "Bad derivative of the user map",
+        )
+        m.ensure(
+            np.allclose(Map("tent").lyapunov([1.5, 1.9], 100, 0.3), np.log([1.5, 1.9])),
+            "Bad Lyapunov exponents of the Tent Map",
+        )
+
+        # the user maps run through the compiled kernels and the workers
+        final = quadratic.final_states(r, 10, 0.2, 500, jobs=2)
+        quadratic.backend = "numpy"
+        m.ensure(
+            np.allclose(final, quadratic.final_states(r, 10, 0.2, 500)),
+            "The user map should not depend on the backend",
+        )
+
+        for expression in ("r*y", "x.real", "__import__('os')", "sin", "r"):
+            try:
+                define_map("bad", expression, [0, 1], [0, 1])
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(
+                    "The expression %r should be rejected" % expression
+                )
+        m.ensure("bad" not in MAPS, "A rejected map should not be registered")
+
+        try:
+            define_map("logistic", "x", [0, 1], [0, 1])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("The built-in maps should not be redefined")
+    finally:
+        for name in ("quadratic", "tent"):
+            MAPS.pop(name, None)
+        os.remove(filename)
+        os.rmdir(tmpdir)
+
+
+def test_map_converged_states():
+    """Test the early termination of the orbits converged to a cycle"""
+
+    print("Running the tests for the converged states of the class 'Map'...")
+
+    m = Map()
+    backends = ["numpy"] + (["numba"] if _jit_orbit(m.map_function) else [])
+    for backend in backends:
+        m.backend = backend
+        _, periods = m.converged_states([2.8, 3.2, 3.5, 3.9], 100, 0.5, 500, 1e-10)
+        m.ensure(
+            list(periods) == [1, 2, 4, 0],
+            "Logistic Map: bad periods %s with the %s backend" % (periods, backend),
+        )
+
+        # the orbits alternate around the fixed point for r < 3, around the
+        # cycle of period 2 for 3 < r < 3.449, and converge slowly close to 3
+        r = np.linspace(2.5, 3.44, 400)
+        _, periods = m.converged_states(r, 1000, 0.5, 2000, 1e-9)
+        m.ensure(
+            np.all(periods[r < 2.99] == 1) and np.all(periods[r > 3.01] == 2),
+            "Logistic Map: periods doubled with the %s backend" % backend,
+        )
+        for r, period in ((2.9, 1), (3.42, 2)):
+            fs = FinalState(r, tol=1e-9)
+            fs.backend = backend
+            fs.getxy()
+            m.ensure(
+                fs.period == period,
+                "FinalState: the period for r=%g should be %d with the %s backend"
+                % (r, period, backend),
+            )
+
+        # the orbits of [3.6, 4] being mostly chaotic, they are all iterated
+        for mapname, rrange in (
+            ("logistic", [1, 4]),
+            ("logistic", [3.6, 4]),
+            ("cubic", [0, 6.5]),
+        ):
+            mm = Map(mapname)
+            mm.backend = backend
+            r = np.linspace(rrange[0], rrange[1], 500)
+            for n, s in ((100, 500), (300, 0), (1000, 130), (10, 200)):
+                states, periods = mm.converged_states(r, n, 0.5, s, 1e-10)
+                m.ensure(
+                    np.allclose(states, mm.final_states(r, n, 0.5, s), atol=1e-7),
+                    "%s Map: the converged states differ" % mapname,
+                )
+                m.ensure(periods.any(), "%s Map: no cycles detected" % mapname)
+
+    fs = FinalState(3.2, tol=1e-10)
+    fs.getxy()
+    m.ensure(fs.period == 2, "FinalState: the period for r=3.2 should be 2")
+
+
+def test_map_scan():
+    """Test the classification of the attractors in the (r, x0) plane"""
+
+    print("Running the tests for the method 'scan'...")
+
+    m = Map()
+    labels = m.scan([2.8, 3.2, 3.5, 3.9], [0.2, 0.5, 0.8])
+    m.ensure(labels.shape == (3, 4) and labels.dtype == np.int8, "Bad label raster")
+    m.ensure(
+        np.all(labels == [1, 2, 4, CHAOTIC]),
+        "Logistic Map: bad attractors %s" % labels,
+    )
+
+    # around the period doubling at r=3 the orbits converge with a negative
+    # multiplier, the slowest ones being still unresolved
+    pp = ParameterPlane([2.5, 3.44], [0.1, 0.9])
+    pp.columns, pp.rows = 95, 5
+    labels, r = pp.getlabels(), np.linspace(2.5, 3.44, 95)
+    m.ensure(
+        np.all(labels[:, r < 2.98] == 1) and np.all(labels[:, r > 3.02] == 2),
+        "Logistic Map: bad attractors around r=3",
+    )
+    summary = pp.summary()
+    m.ensure(
+        set(summary["periods"]) == {1, 2} and summary["multistable"] == 0,
+        "Logistic Map: bad summary %s" % summary,
+    )
+
+    # the fixed point 0 of the Cubic Map coexists with a cycle of period 2
+    mm = Map("cubic")
+    r, x0 = np.linspace(5, 6, 41), np.linspace(0, 1, 30)
+    labels = mm.scan(r, x0)
+    m.ensure(
+        labels[0, 20] == 1 and labels[15, 20] == 2,
+        "Cubic Map: the attractors should depend on x0 for r=5.5",
+    )
+    m.ensure(
+        np.array_equal(mm.scan(r, x0, jobs=2, chunk_size=500), labels),
+        "Cubic Map: the parallel scan differs",
+    )
+
+    pp = ParameterPlane([5, 6], [0, 1], mapname="cubic")
+    pp.columns, pp.rows = 41, 30
+    m.ensure(np.array_equal(pp.getlabels(), labels), "Bad labels of ParameterPlane")
+
+    summary = pp.summary()
+    m.ensure(
+        abs(
+            summary["escaped"]
+            + summary["chaotic"]
+            + summary["unresolved"]
+            + sum(summary["periods"].values())
+            - 1
+        )
+        < 1e-12,
+        "The fractions of the labels should add up to one",
+    )
+    m.ensure(
+        summary["periods"][1] > 0 and summary["multistable"] > 0.5,
+        "Cubic Map: bad summary %s" % summary,
+    )
+
+
 def test_class_logistic():
     """Test the class 'Logistic'"""
 
@@ -60,6 +434,19 @@ def test_class_logistic():
     m.ensure(y1[n] == y1[n - 2], "y1 is expected to be periodic with period 2")
     m.ensure(y1[n - 1] == y1[n - 3], "y1 is expected to be periodic with period 2")
 
+    x, y1 = Logistic(r, n, x0, 30).getxy()
+    m.ensure(x[0] == 30 and x[n] == n + 30, "x should contain the times 30..n+30")
+    m.ensure(len(y1) == n + 1, "the skipped states should not be stored")
+    m.ensure(not hasattr(le1, "__dict__"), "Logistic should be slots based")
+
+    fs = FinalState(r)
+    x, y1 = fs.getxy()
+    m.ensure(len(x) == fs.n + 1, "the skipped final states should not be stored")
+    m.ensure(
+        len(y1) == fs.n + 1 and y1.strides == (0,) and np.all(y1 == 0.5),
+        "y1 should be a constant vector without storage",
+    )
+
 
 def test_class_logisticdiff():
     """Test the class 'LogisticDiff'"""
@@ -89,7 +476,308 @@ def test_class_logisticdiff():
     )
 
 
+def test_class_logisticensemble():
+    """Test the class 'LogisticEnsemble'"""
+
+    print("Running the tests for the class 'LogisticEnsemble'...")
+
+    r, n = 4.0, 60
+    seeds = 0.2 + np.arange(100) * 1e-9
+    ens = LogisticEnsemble(r, n, seeds)
+    x, y = ens.getxy()
+
+    le2 = LogisticDiff(r, n, seeds[0], seeds[-1])
+    _, y1, y2 = le2.getxy()
+
+    m = Map()
+    m.ensure(len(x) == n + 1, "x should be a vector of size %d" % (n + 1))
+    m.ensure(y.shape == (n + 1, seeds.size), "Bad shape of the ensemble orbits")
+    m.ensure(
+        np.array_equal(y[:, 0], y1) and np.array_equal(y[:, -1], y2),
+        "The ensemble orbits should match the ones of LogisticDiff",
+    )
+
+    spread = ens.spread()
+    m.ensure(spread[0] < 1e-7 and spread[-1] > 0.1, "The ensemble should spread")
+
+    divergence = ens.divergence()
+    m.ensure(np.all(divergence[:, 0] == 0), "The reference seed cannot diverge")
+
+    times = ens.divergence_time(0.1)
+    m.ensure(times[0] == -1, "The reference seed cannot diverge")
+    m.ensure(np.all(times[1:] > 10), "The nearby seeds should diverge later")
+    m.ensure(
+        times[1] >= times[-1], "The farthest seed should diverge first (%s)" % times
+    )
+    m.ensure(
+        divergence[times[-1], -1] > 0.1 and divergence[times[-1] - 1, -1] <= 0.1,
+        "Bad divergence time",
+    )
+
+
+def test_class_bifurcation():
+    """Test the class 'Bifurcation'"""
+
+    print("Running the tests for the class 'Bifurcation'...")
+
+    n, s = 50, 100
+    for mapname, rrange in (
+        ("logistic", [2.8, 4.0]),
+        ("cubic", [4.0, 6.5]),
+        ("sine", [0.5, 2.0]),
+    ):
+        bd = Bifurcation(rrange, [0, 1], n, s, mapname)
+        r, states = bd.getxy()
+
+        m = Map(mapname)
+        m.ensure(len(r) == 1000, "r should be a vector of size 1000")
+        m.ensure(
+            states.shape == (n + 1, len(r)),
+            "the final states should be a matrix of shape (%d, %d)" % (n + 1, len(r)),
+        )
+        for i in (0, 333, 999):
+            x, _ = FinalState(r[i], n, 0.5, s, mapname).getxy()
+            m.ensure(
+                np.allclose(states[:, i], x, rtol=0, atol=1e-9),
+                "%s Map: the batched final states differ for r=%g" % (mapname, r[i]),
+            )
+
+        _, pstates = Bifurcation(rrange, [0, 1], n, s, mapname, jobs=2).getxy()
+        m.ensure(
+            np.array_equal(pstates, states),
+            "%s Map: the parallel final states differ" % mapname,
+        )
+
+        chunks = list(
+            Bifurcation(rrange, [0, 1], n, s, mapname, chunk_size=300).iterchunks()
+        )
+        m.ensure(len(chunks) == 4, "%s Map: the r grid should be in 4 chunks" % mapname)
+        m.ensure(
+            np.array_equal(np.hstack([c[1] for c in chunks]), states),
+            "%s Map: the chunked final states differ" % mapname,
+        )
+
+        counts = bd.gethistogram(200)
+        m.ensure(counts.shape == (200, 1000), "%s Map: bad histogram shape" % mapname)
+        m.ensure(
+            counts.sum() == np.count_nonzero(states <= 1),
+            "%s Map: the histogram should count all the final states" % mapname,
+        )
+
+        chunked = Bifurcation(rrange, [0, 1], n, s, mapname, 2, 300)
+        m.ensure(
+            np.array_equal(
+                chunked.gethistogram(200),
+                np.histogram2d(
+                    states.ravel(),
+                    np.broadcast_to(r, states.shape).ravel(),
+                    bins=(200, 1000),
+                    range=[[0, 1], rrange],
+                )[0],
+            ),
+            "%s Map: the chunked histogram differs" % mapname,
+        )
+
+    bd = Bifurcation([3, 4], [0, 1], 100, 200)
+    bd.chunk_size = 100
+    bd.fit(640, 480)
+    m.ensure(
+        0 < bd.columns < 640 and 0 < bd.n < 480 and bd.rows == bd.n,
+        "The resolution should be given by the plot area of the figure",
+    )
+    columns, n = bd.columns, bd.n
+    bd.plotlyapunov = True
+    bd.fit(640, 480)
+    m.ensure(bd.columns == columns and bd.n < n / 2, "Bad resolution of the subplot")
+    m.ensure(
+        bd.budget()
+        == {
+            "columns": bd.columns,
+            "samples": bd.n + 1,
+            "evaluations": bd.columns * (bd.n + 200),
+            "bytes": 100 * (bd.n + 1) * 8,
+        },
+        "Bad compute budget %s" % bd.budget(),
+    )
+
+
+def test_bifurcation_adaptive():
+    """Test the adaptive sampling of the class 'Bifurcation'"""
+
+    print("Running the tests for the adaptive sampling of 'Bifurcation'...")
+
+    bd = Bifurcation([2.5, 3.5], [0, 1], 100, 500)
+    bd.adaptive = True
+    r, states = bd.getxy()
+
+    bd.ensure(r.size <= bd.columns, "Too many r values sampled")
+    bd.ensure(np.all(np.diff(r) > 0), "The r values should be sorted")
+    bd.ensure(states.shape == (101, r.size), "Bad shape of the final states")
+    bd.ensure(
+        np.count_nonzero(abs(r - 3.0) < 0.05) > np.count_nonzero(abs(r - 2.65) < 0.05),
+        "The period doubling at r=3 should be sampled more than the fixed points",
+    )
+
+
+def test_bifurcation_explorer():
+    """Test the class 'BifurcationExplorer'"""
+
+    print("Running the tests for the class 'BifurcationExplorer'...")
+
+    explorer = BifurcationExplorer(Bifurcation([2.8, 4], [0, 1], 20, 100))
+    fig = explorer.figure()
+    try:
+        computed = explorer.computed
+        Map.ensure(computed > 0, "The visible window should be computed")
+        Map.ensure(
+            explorer.image.get_array().shape[1] == int(explorer.axes.bbox.width),
+            "The window should be computed at the screen resolution",
+        )
+
+        explorer.axes.set_xlim([3.5, 3.6])
+        explorer.axes.set_ylim([0.3, 0.6])
+        explorer.update()
+        Map.ensure(explorer.computed > computed, "The zoom should be computed")
+        Map.ensure(
+            explorer.image.get_extent() == [3.5, 3.6, 0.3, 0.6],
+            "The image should cover the zoomed window",
+        )
+
+        # going back to the first window only reuses the tiles in memory
+        computed = explorer.computed
+        explorer.axes.set_xlim([2.8, 4])
+        explorer.axes.set_ylim([0, 1])
+        explorer.update()
+        Map.ensure(explorer.computed == computed, "The tiles should be reused")
+
+        explorer.maxtiles = 4
+        explorer.update(4)
+        Map.ensure(len(explorer.tiles) <= 4, "Too many tiles kept in memory")
+    finally:
+        plt.close(fig)
+
+
+def test_class_vectormap():
+    """Test the batched orbits of the maps of a vector state"""
+
+    print("Running the tests for the class 'VectorMap'...")
+
+    m = VectorMap("henon")
+    m.ensure(m.orbit(n=10).shape == (11, 2), "Bad shape of the Henon orbit")
+
+    # the fixed point is stable for a < 3(1-b)^2/4 and followed by a cycle
+    # of period 2 (and of period 4 from a = 0.9125)
+    a, b = np.array([0.2, 0.5, 1.0]), 0.3
+    states = m.final_states([a, b], 8, [0, 0], 2000)
+    m.ensure(states.shape == (9, 2, 3), "Bad shape of the final states")
+    fixed = (b - 1 + np.sqrt((1 - b) ** 2 + 4 * a[0])) / (2 * a[0])
+    m.ensure(np.allclose(states[:, :, 0], [fixed, b * fixed]), "Bad fixed point")
+    for column, period in ((1, 2), (2, 4)):
+        x = states[:, 0, column]
+        m.ensure(
+            np.allclose(x[period:], x[:-period])
+            and not np.allclose(x[period // 2 :], x[: -period // 2]),
+            "The Henon Map should have a cycle of period %d at a=%g",
+            period,
+            a[column],
+        )
+    m.ensure(
+        np.array_equal(m.final_states([a, b], 8, [0, 0], 2000, jobs=2), states),
+        "The parallel final states differ",
+    )
+
+    standard = VectorMap("standard").orbit([[0.5, 3]], [1, 2], 1000)
+    m.ensure(
+        np.all((standard >= 0) & (standard < 2 * np.pi)),
+        "The Standard Map should stay on the torus",
+    )
+
+    for args in ([1.4], [1, 2, 3]):
+        try:
+            m.orbit(args)
+        except AssertionError:
+            pass
+        else:
+            raise AssertionError("Bad parameters should not be accepted")
+    try:
+        m.backend = "numba"
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("The numba backend iterates only scalar states")
+
+
+def test_class_attractor():
+    """Test the density raster of the attractors"""
+
+    print("Running the tests for the class 'Attractor'...")
+
+    at = Attractor(n=200, seeds=500)
+    at.columns, at.rows = 64, 48
+    counts = at.gethistogram()
+    at.ensure(counts.shape == (48, 64), "Bad shape of the histogram")
+
+    # the Henon attractor fits in the plot ranges
+    chunks = list(at.iterchunks())
+    states = np.concatenate(chunks)
+    at.ensure(states.shape[1:] == (2, chunks[0].shape[2]), "Bad chunks")
+    at.ensure(
+        states.shape[0] == 200 and counts.sum() == states.shape[0] * states.shape[2],
+        "All the states of the Henon attractor should be counted",
+    )
+    at.ensure(states.shape[2] < 500, "The escaped orbits should be dropped")
+
+    at.chunk_size = 7
+    at.ensure(
+        np.array_equal(at.gethistogram(), counts),
+        "The histogram should not depend on the chunk size",
+    )
+
+    zoom = Attractor(x=[0.5, 0.8], y=[0.1, 0.25], n=200, seeds=500)
+    zoom.columns, zoom.rows = 64, 48
+    zoom.ensure(
+        0 < zoom.gethistogram().sum() < counts.sum(),
+        "A zoom should count the states of its window only",
+    )
+
+
+def test_save():
+    """Test the headless rendering of the plots to files"""
+
+    print("Running the tests for the method 'save'...")
+
+    tmpdir = tempfile.mkdtemp()
+    for obj, ext in (
+        (Logistic(3.2, 20, 0.4), "png"),
+        (FinalState(3.2, 20, 0.4, 10), "svg"),
+        (LogisticDiff(4.0, 20, 0.2, 0.21), "pdf"),
+        (Bifurcation([3, 4], [0, 1], 10, 10), "png"),
+        (Attractor(mapname="lozi", n=10, seeds=100), "png"),
+    ):
+        filename = os.path.join(tmpdir, "%s.%s" % (type(obj).__name__, ext))
+        obj.save(filename, dpi=50)
+        obj.ensure(os.path.getsize(filename) > 0, "%s has not been saved" % filename)
+        obj.ensure(not plt.get_fignums(), "The figures should be released")
+        os.remove(filename)
+    os.rmdir(tmpdir)
+
+
 def tests():
+    test_import()
     test_class_map()
+    test_map_orbit()
+    test_map_backends()
+    test_map_lyapunov()
+    test_map_precision()
+    test_define_map()
+    test_map_converged_states()
+    test_map_scan()
     test_class_logistic()
     test_class_logisticdiff()
+    test_class_logisticensemble()
+    test_class_bifurcation()
+    test_bifurcation_adaptive()
+    test_bifurcation_explorer()
+    test_class_vectormap()
+    test_class_attractor()
+    test_save()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+
+# Profiling of the computations of the Logistic Equation Library
+# Copyright (C) 2016-2018 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Davide Madrisan"
+__copyright__ = "Copyright (C) 2016-2018 Davide Madrisan"
+__license__ = "Apache License 2.0"
+__version__ = "1"
+__email__ = "davide.madrisan@gmail.com"
+__status__ = "stable"
+
+import contextlib
+import json
+import time
+import tracemalloc
+
+
+class Profiler(object):
+    """Collector of the wall time and of the peak memory (as traced by the
+    module tracemalloc) of the phases of a computation, along with the
+    number of map evaluations. Usage:
+
+        m = Bifurcation([3, 4], [0, 1])
+        m.profiler = Profiler()
+        m.save("bifurcation.png")
+        print(m.profiler.report())
+
+    The phases can be nested: the time of a phase does not include the one
+    of the phases nested in it, while its peak memory does. The peak memory
+    of a phase is exact when it raises the peak traced so far (since the
+    start of the outermost phase), and is otherwise estimated by the memory
+    traced at its entry and exit"""
+
+    def __init__(self):
+        self.phases = {}  # name: [seconds, peak memory in bytes, calls]
+        self.evaluations = 0  # Number of evaluations of the map function
+
+        self._stack = []
+        self._tracing = False  # Whether tracemalloc was started here
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Context manager measuring the enclosed code as the phase 'name'"""
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        # tracemalloc.reset_peak() requires Python 3.9: the traced peak is
+        # that of the phase only if the phase raises it
+        current, before = tracemalloc.get_traced_memory()
+
+        # [start time, seconds spent in the nested phases, peak memory]
+        entry = [time.perf_counter(), 0.0, current]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - entry[0]
+            current, after = tracemalloc.get_traced_memory()
+            peak = max(entry[2], current, after if after > before else 0)
+            self._stack.pop()
+
+            record = self.phases.setdefault(name, [0.0, 0, 0])
+            record[0] += elapsed - entry[1]
+            record[1] = max(record[1], peak)
+            record[2] += 1
+
+            if self._stack:
+                self._stack[-1][1] += elapsed
+                self._stack[-1][2] = max(self._stack[-1][2], peak)
+            elif self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+    def count(self, evaluations):
+        """Add 'evaluations' to the number of map evaluations"""
+
+        self.evaluations += int(evaluations)
+
+    def report(self):
+        """Return a dictionary with the time and peak memory of each phase,
+        the number of map evaluations, and the evaluations per second of
+        the 'compute' phase"""
+
+        compute = self.phases.get("compute", [0.0])[0]
+
+        return {
+            "phases": dict(
+                (
+                    name,
+                    {"seconds": seconds, "peak_memory": peak, "calls": calls},
+                )
+                for name, (seconds, peak, calls) in self.phases.items()
+            ),
+            "seconds": sum(record[0] for record in self.phases.values()),
+            "evaluations": self.evaluations,
+            "evaluations_per_second": self.evaluations / compute if compute else None,
+        }
+
+    def write(self, filename):
+        """Write the report in JSON format to 'filename'"""
+
+        with open(filename, "w") as f:
+            json.dump(self.report(), f, indent=2, sort_keys=True)
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+
+# Profiling of the computations - Unit tests
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import print_function
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import matplotlib
+import numpy as np
+
+from leprofile import Profiler
+from lelib import Map, Bifurcation, FinalState
+
+
+def test_class_profiler():
+    """Test the class 'Profiler'"""
+
+    print("Running the tests for the class 'Profiler'...")
+
+    profiler = Profiler()
+    with profiler.phase("outer"):
+        buffer = np.ones(1 << 20)
+        with profiler.phase("inner"):
+            time.sleep(0.05)
+            inner = np.ones(1 << 21)
+        del inner
+        # a phase not raising the peak of the previous ones is estimated
+        with profiler.phase("later"):
+            later = np.ones(1 << 19)
+        del buffer, later
+    profiler.count(10)
+
+    report = profiler.report()
+    outer, inner = report["phases"]["outer"], report["phases"]["inner"]
+    Map.ensure(inner["seconds"] >= 0.05, "The inner phase time is too short")
+    Map.ensure(
+        outer["seconds"] < inner["seconds"],
+        "The time of the nested phases should not be included",
+    )
+    Map.ensure(
+        inner["peak_memory"] >= 16 << 20 and outer["peak_memory"] >= 24 << 20,
+        "The peak memory should include the nested phases",
+    )
+    Map.ensure(
+        12 << 20 <= report["phases"]["later"]["peak_memory"] < 24 << 20,
+        "Bad peak memory of a phase not raising the traced peak",
+    )
+    Map.ensure(report["evaluations"] == 10, "Bad number of evaluations")
+    Map.ensure(
+        report["evaluations_per_second"] is None,
+        "No evaluation rate without a compute phase",
+    )
+
+
+def test_profiling_hook():
+    """Test the profiling hook of the Map classes"""
+
+    print("Running the tests for the profiling of the Map classes...")
+
+    matplotlib.use("Agg")
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        profile(tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def profile(tmpdir):
+    n, s = 50, 100
+    for jobs in (1, 2):
+        bd = Bifurcation([3, 4], [0, 1], n, s, jobs=jobs)
+        bd.profiler = Profiler()
+        bd.save(os.path.join(tmpdir, "bifurcation.png"))
+
+        report = bd.profiler.report()
+        Map.ensure(
+            sorted(report["phases"]) == ["compute", "figure", "render"],
+            "Bad profiled phases %s" % sorted(report["phases"]),
+        )
+        Map.ensure(
+            report["evaluations"] == bd.columns * (n + s),
+            "Bad number of evaluations %d with %d jobs",
+            report["evaluations"],
+            jobs,
+        )
+        Map.ensure(report["evaluations_per_second"] > 0, "Bad evaluation rate")
+
+    fs = FinalState(3.2, n, 0.5, s, tol=1e-10)
+    fs.profiler = Profiler()
+    fs.getxy()
+    Map.ensure(
+        0 < fs.profiler.evaluations < n + s,
+        "The converged orbits should stop early",
+    )
+
+    filename = os.path.join(tmpdir, "profile.json")
+    fs.profiler.write(filename)
+    with open(filename) as f:
+        Map.ensure(
+            json.load(f)["evaluations"] == fs.profiler.evaluations, "Bad JSON report"
+        )
+
+
+def tests():
+    test_class_profiler()
+    test_profiling_hook()
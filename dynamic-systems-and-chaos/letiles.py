@@ -0,0 +1,278 @@
+#!/usr/bin/python3
+
+# Tile server for the Bifurcation Diagrams of the Logistic Equation Library
+# Copyright (C) 2016-2018 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Davide Madrisan"
+__copyright__ = "Copyright (C) 2016-2018 Davide Madrisan"
+__license__ = "Apache License 2.0"
+__version__ = "1"
+__email__ = "davide.madrisan@gmail.com"
+__status__ = "stable"
+
+import collections
+import concurrent.futures
+import io
+import re
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import lelib
+from lelib import MAPS, Bifurcation, define_map
+
+# The deepest zoom level served: at zoom z the diagram is split in 2^z x 2^z
+# tiles, so that a pixel of a tile at zoom 32 is about 10^-10 r units wide
+MAXZOOM = 32
+
+# The number of states in a pixel rendered in black
+SATURATION = 16
+
+# The URL of a tile: /<map>/<zoom>/<x>/<y>.png, with y = 0 on the top
+_TILE_URL = re.compile(r"^/(\w+)/(\d+)/(\d+)/(\d+)\.png$")
+
+
+def tile_window(mapname, zoom, x, y):
+    """Return the range of r and the range of the states covered by the
+    tile (zoom, x, y) of the diagram of 'mapname', in the slippy map
+    scheme: the tiles at a given zoom split the whole diagram in 2^zoom
+    columns (x from the left) and 2^zoom rows (y from the top)"""
+
+    definition = MAPS[mapname]
+    side = 2**zoom
+    rwidth = (definition.rmax - definition.rmin) / float(side)
+    yheight = (definition.ymax - definition.ymin) / float(side)
+
+    # the last tiles must not exceed the ranges because of the rounding
+    return (
+        [
+            definition.rmin + x * rwidth,
+            min(definition.rmin + (x + 1) * rwidth, definition.rmax),
+        ],
+        [
+            max(definition.ymax - (y + 1) * yheight, definition.ymin),
+            definition.ymax - y * yheight,
+        ],
+    )
+
+
+def render_tile(args):
+    """Compute the bifurcation diagram of a tile and return it as a PNG image
+    (helper function executed by the workers of the tile pool). The samples
+    per column grow with the zoom, so that a chaotic band keeps about one
+    state per pixel, up to 'maxsamples'"""
+
+    mapname, source, zoom, x, y, options = args
+
+    if source is not None and mapname not in MAPS:
+        define_map(mapname, **source)
+
+    tilesize = options["tilesize"]
+    r, states = tile_window(mapname, zoom, x, y)
+    n = min(tilesize << zoom, options["maxsamples"])
+
+    bd = Bifurcation(r, states, n, options["s"], mapname)
+    bd.backend = options["backend"]
+    bd.precision = options["precision"]
+    bd.tol = options["tol"]
+    bd.columns = bd.rows = tilesize
+    counts = bd.gethistogram()
+
+    from matplotlib.image import imsave
+
+    # log shading on the same scale for all the tiles, so that they match
+    # at their borders: the chaotic bands get a few states per pixel, and
+    # the pixels with more than SATURATION states are black
+    png = io.BytesIO()
+    imsave(
+        png,
+        np.log1p(counts[::-1]),
+        vmin=0,
+        vmax=np.log1p(SATURATION),
+        cmap="Greys",
+        format="png",
+    )
+    return png.getvalue()
+
+
+class TileCache(object):
+    """Provider of the PNG tiles of the bifurcation diagrams, computed by the
+    workers of 'executor' (a concurrent.futures executor). The 'maxtiles'
+    most recently used tiles are kept in memory, and all the computed tiles
+    are stored in the optional lecache.Cache object 'cache'. Concurrent
+    requests of a tile being computed wait for the same computation"""
+
+    def __init__(
+        self,
+        executor,
+        cache=None,
+        maxtiles=1024,
+        tilesize=256,
+        s=1000,
+        maxsamples=16384,
+        tol=1e-9,
+        backend="auto",
+        precision="float64",
+    ):
+        self.executor = executor
+        self.cache = cache
+        self.maxtiles = maxtiles
+        self.options = {
+            "tilesize": tilesize,
+            "s": s,
+            "maxsamples": maxsamples,
+            "tol": tol,
+            "backend": backend,
+            "precision": precision,
+        }
+
+        # Number of tiles served from memory, from the cache, after
+        # waiting for the computation of another request, and computed
+        self.stats = {"memory": 0, "disk": 0, "shared": 0, "computed": 0}
+
+        self._tiles = collections.OrderedDict()  # (map, zoom, x, y): PNG
+        self._pending = {}  # (map, zoom, x, y): Future of the PNG
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def valid(mapname, zoom, x, y):
+        """Return whether (mapname, zoom, x, y) is the name of a tile"""
+
+        return (
+            mapname in MAPS
+            and 0 <= zoom <= MAXZOOM
+            and 0 <= x < 2**zoom
+            and 0 <= y < 2**zoom
+        )
+
+    def get(self, mapname, zoom, x, y):
+        """Return the PNG image of the tile (zoom, x, y) of 'mapname'"""
+
+        tile = (mapname, zoom, x, y)
+        with self._lock:
+            png = self._tiles.get(tile)
+            if png is not None:
+                self._tiles.move_to_end(tile)
+                self.stats["memory"] += 1
+                return png
+
+            future = self._pending.get(tile)
+            if future is not None:
+                self.stats["shared"] += 1
+            else:
+                self._pending[tile] = concurrent.futures.Future()
+
+        if future is not None:
+            return future.result()
+
+        try:
+            png = self._load(tile)
+        except BaseException as e:
+            with self._lock:
+                future = self._pending.pop(tile)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._tiles[tile] = png
+            while len(self._tiles) > self.maxtiles:
+                self._tiles.popitem(last=False)
+            future = self._pending.pop(tile)
+        future.set_result(png)
+
+        return png
+
+    def _load(self, tile):
+        """Look for the tile in the on-disk cache, or compute it"""
+
+        mapname, zoom, x, y = tile
+        source = MAPS[mapname].source
+
+        if self.cache is not None:
+            key = self.cache.key(
+                tile=[mapname, zoom, x, y],
+                source=source,
+                version=lelib.__version__,
+                **self.options
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self._lock:
+                    self.stats["disk"] += 1
+                return cached.tobytes()
+
+        png = self.executor.submit(
+            render_tile, (mapname, source, zoom, x, y, self.options)
+        ).result()
+        with self._lock:
+            self.stats["computed"] += 1
+
+        # the disk cache is best effort: the tile is served even if it
+        # cannot be stored (full or removed cache directory, say)
+        if self.cache is not None:
+            try:
+                self.cache.put(key, np.frombuffer(png, dtype=np.uint8))
+            except OSError:
+                pass
+
+        return png
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """Handler of the HTTP requests of the tiles: GET /<map>/<zoom>/<x>/<y>.png"""
+
+    def do_GET(self):
+        if self.path in ("/", "/index.html"):
+            self._send(
+                200,
+                "text/plain; charset=utf-8",
+                (
+                    "Bifurcation diagram tiles: /<map>/<zoom>/<x>/<y>.png\n"
+                    "Maps: %s\n" % ", ".join(MAPS)
+                ).encode("utf-8"),
+            )
+            return
+
+        match = _TILE_URL.match(self.path)
+        tile = match and (match.group(1),) + tuple(int(i) for i in match.groups()[1:])
+        if not tile or not self.server.tiles.valid(*tile):
+            self.send_error(404, "No such tile")
+            return
+
+        try:
+            png = self.server.tiles.get(*tile)
+        except Exception as e:
+            self.send_error(500, "Cannot compute the tile: %s" % e)
+            return
+
+        self._send(200, "image/png", png)
+
+    def _send(self, code, content_type, body):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class TileServer(ThreadingHTTPServer):
+    """HTTP server of the tiles provided by the TileCache object 'tiles',
+    each request being handled by its own thread. Usage:
+
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            server = TileServer(("127.0.0.1", 8000), TileCache(executor))
+            server.serve_forever()"""
+
+    daemon_threads = True
+
+    def __init__(self, address, tiles, verbose=False):
+        ThreadingHTTPServer.__init__(self, address, TileHandler)
+        self.tiles = tiles
+        self.verbose = verbose  # Log the requests to stderr
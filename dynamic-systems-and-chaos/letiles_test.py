@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+
+# Tile server for the Bifurcation Diagrams - Unit tests
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import print_function
+import concurrent.futures
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+
+from lecache import Cache
+from lelib import Map
+from letiles import TileCache, TileServer, tile_window
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_tile_window():
+    """Test the windows of the diagram covered by the tiles"""
+
+    print("Running the tests for the function 'tile_window'...")
+
+    Map.ensure(
+        tile_window("logistic", 0, 0, 0) == ([0, 4.0], [0, 1]),
+        "The tile at zoom 0 should cover the whole diagram",
+    )
+    Map.ensure(
+        tile_window("sine", 2, 3, 0) == ([1.5, 2.0], [1.5, 2.0]),
+        "The tile y=0 should be on the top right of the diagram",
+    )
+
+
+def test_class_tilecache():
+    """Test the class 'TileCache'"""
+
+    print("Running the tests for the class 'TileCache'...")
+
+    options = {"maxtiles": 2, "tilesize": 16, "s": 50, "maxsamples": 64}
+    cachedir = tempfile.mkdtemp()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            tiles = TileCache(executor, Cache(cachedir), **options)
+            Map.ensure(tiles.valid("logistic", 1, 1, 1), "The tile should exist")
+            for tile in (
+                ("nope", 0, 0, 0),
+                ("logistic", 1, 2, 0),
+                ("logistic", 1, 0, 2),
+            ):
+                Map.ensure(not tiles.valid(*tile), "No tile %s expected", tile)
+
+            # the concurrent requests of a tile share its computation
+            results = []
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(tiles.get("logistic", 1, 1, 0))
+                )
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            png = results[0]
+            Map.ensure(png.startswith(PNG_SIGNATURE), "The tile should be a PNG")
+            Map.ensure(
+                results == [png] * 8
+                and tiles.stats["computed"] == 1
+                and tiles.stats["memory"] + tiles.stats["shared"] == 7,
+                "The tile should be computed once: %s",
+                tiles.stats,
+            )
+
+            # only the two most recently used tiles are kept in memory
+            tiles.get("logistic", 1, 0, 0)
+            tiles.get("cubic", 0, 0, 0)
+            tiles.get("logistic", 1, 1, 0)
+            Map.ensure(tiles.stats["computed"] == 3, "The LRU tile should be evicted")
+            Map.ensure(
+                tiles.stats["disk"] == 1, "The evicted tile should be read from disk"
+            )
+
+            # the tiles computed by another server are read from disk
+            other = TileCache(executor, Cache(cachedir), **options)
+            Map.ensure(
+                other.get("logistic", 1, 1, 0) == png
+                and other.stats["disk"] == 1
+                and other.stats["computed"] == 0,
+                "The tile should be read from the disk cache",
+            )
+
+            # the tiles that cannot be stored on disk are still served
+            shutil.rmtree(cachedir)
+            png = other.get("cubic", 1, 0, 1)
+            Map.ensure(
+                png.startswith(PNG_SIGNATURE)
+                and other.get("cubic", 1, 0, 1) == png
+                and other.stats["memory"] == 1,
+                "The tile should be kept in memory without a disk cache",
+            )
+    finally:
+        shutil.rmtree(cachedir, ignore_errors=True)
+
+
+def test_class_tileserver():
+    """Test the HTTP requests of the tiles"""
+
+    print("Running the tests for the class 'TileServer'...")
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        server = TileServer(
+            ("127.0.0.1", 0), TileCache(executor, tilesize=16, s=50, maxsamples=64)
+        )
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        url = "http://127.0.0.1:%d/" % server.server_port
+        try:
+            response = urllib.request.urlopen(url + "sine/2/1/3.png")
+            Map.ensure(
+                response.headers["Content-Type"] == "image/png"
+                and response.read().startswith(PNG_SIGNATURE),
+                "The server should return a PNG tile",
+            )
+
+            for path in ("sine/2/4/0.png", "nope/0/0/0.png", "sine/1/0"):
+                try:
+                    urllib.request.urlopen(url + path)
+                except urllib.error.HTTPError as e:
+                    Map.ensure(e.code == 404, "Bad HTTP error %d", e.code)
+                else:
+                    raise AssertionError("No tile expected at %s" % path)
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+def tests():
+    test_tile_window()
+    test_class_tilecache()
+    test_class_tileserver()
@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+
+# Plot the Attractors of Logistic, Cubic, and Sine Maps in the (r, x0) Plane
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import sys
+
+import matplotlib
+
+from lecache import Cache
+from lelib import Map, ParameterPlane
+from leprofile import Profiler
+from utils import (
+    add_backend_arguments,
+    add_cache_arguments,
+    add_map_argument,
+    add_output_arguments,
+    argparser,
+    die,
+)
+
+
+def parse_args():
+    """This function parses and return arguments passed in"""
+    descr = "Plot the Attractors of Logistic, Cubic, and Sine Maps in the (r, x0) Plane"
+    examples = """
+      %(prog)s -r 2.8:4
+      %(prog)s --map=cubic -j 0
+      %(prog)s --map=cubic -r 5:6.5 --columns 800 --rows 600 -c 100000
+      %(prog)s --map=sine -s 2000 --max-period 64 --export=sine.npz"""
+
+    parser = argparser(descr, examples)
+
+    # By default, make 1000 iterations for reaching the attractors (s),
+    # and 100 more for estimating the Lyapunov exponents (n)
+    # By default select the Logistic Equation
+
+    parser.add_argument(
+        "-r",
+        "--rate",
+        action="store",
+        dest="r",
+        help="range of the growth rate parameter (default: the entire range)",
+    )
+    parser.add_argument(
+        "-0",
+        "--x0",
+        action="store",
+        dest="x0",
+        help="range of the initial conditions (default: the entire range)",
+    )
+    parser.add_argument(
+        "-s",
+        "--skip",
+        action="store",
+        dest="s",
+        type=int,
+        default=1000,
+        help="iterations for reaching the attractors (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-n",
+        "--steps",
+        action="store",
+        dest="n",
+        type=int,
+        default=100,
+        help="iterations for the Lyapunov exponents (default: %(default)s)",
+    )
+    add_map_argument(parser)
+    parser.add_argument(
+        "--columns",
+        action="store",
+        dest="columns",
+        type=int,
+        default=400,
+        help="number of growth rates (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rows",
+        action="store",
+        dest="rows",
+        type=int,
+        default=300,
+        help="number of initial conditions (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        action="store",
+        dest="tol",
+        type=float,
+        default=1e-9,
+        help="tolerance for detecting the cycles (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-period",
+        action="store",
+        dest="maxperiod",
+        type=int,
+        default=32,
+        help="longest period of the detected cycles (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="number of worker processes, 0 for all the CPUs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        action="store",
+        dest="chunk_size",
+        type=int,
+        help="compute at most 'chunk_size' (r, x0) pairs at once (default: all)",
+    )
+    add_backend_arguments(parser)
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    mapobj = Map(args.map_name)
+
+    # range to vector: "1:4" --> [1., 4.]
+    def r2v(a, minval, maxval):
+        return [float(i) for i in a.split(":")] if a else [minval, maxval]
+
+    # Scan the entire plane by default
+    pp = ParameterPlane(
+        r2v(args.r, mapobj.map_rmin, mapobj.map_rmax),
+        r2v(args.x0, mapobj.map_ymin, mapobj.map_ymax),
+        args.n,
+        args.s,
+        args.map_name,
+        args.jobs,
+        args.chunk_size,
+    )
+    pp.backend = args.backend
+    pp.precision = args.precision
+    pp.cache = None if args.nocache else Cache(args.cachedir)
+    pp.columns = args.columns
+    pp.rows = args.rows
+    pp.tol = args.tol
+    pp.maxperiod = args.maxperiod
+
+    if args.profile:
+        pp.profiler = Profiler()
+
+    summary = pp.summary()
+    print(
+        "escaped: %.1f%%, chaotic: %.1f%%, unresolved: %.1f%%, "
+        "multistable r values: %.1f%%"
+        % (
+            100 * summary["escaped"],
+            100 * summary["chaotic"],
+            100 * summary["unresolved"],
+            100 * summary["multistable"],
+        )
+    )
+    for period, fraction in sorted(summary["periods"].items()):
+        print("%s: %.1f%%" % (pp.labelname(period), 100 * fraction))
+
+    if args.export:
+        try:
+            pp.export(args.export)
+        except (ImportError, ValueError) as e:
+            die(2, str(e))
+
+    if args.output:
+        # render the plot without any GUI
+        matplotlib.use("Agg")
+        pp.save(args.output, args.dpi)
+    elif not args.export:
+        pp.plot()
+
+    if args.profile:
+        pp.profiler.write(args.profile)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        die(3, "Exiting on user request")
+
+    sys.exit()
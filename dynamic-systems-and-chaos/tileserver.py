@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+
+# Serve the Bifurcation Diagrams of Logistic, Cubic, and Sine Maps as Tiles
+# Copyright (C) 2016-2019 Davide Madrisan <davide.madrisan@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import concurrent.futures
+import multiprocessing
+import sys
+
+from lecache import Cache
+from lelib import MAPS
+from letiles import MAXZOOM, TileCache, TileServer
+from utils import (
+    add_backend_arguments,
+    add_cache_arguments,
+    add_map_definitions,
+    argparser,
+    die,
+)
+
+
+def parse_args():
+    """This function parses and return arguments passed in"""
+    descr = "Serve the Bifurcation Diagrams of Logistic, Cubic, and Sine Maps as Tiles"
+    examples = """
+      %(prog)s
+      %(prog)s --port 8080 -j 4
+      %(prog)s --tile-size 512 --max-samples 65536 --cache-dir /srv/tiles
+      %(prog)s --define-map quadratic "r*x*(1-x)**2" 0:6.75 0:1"""
+
+    parser = argparser(descr, examples)
+
+    # By default, serve the tiles to the local host only, computing them
+    # with all the CPUs and skipping the first 1000 iterations of the orbits
+
+    parser.add_argument(
+        "--host",
+        action="store",
+        dest="host",
+        default="127.0.0.1",
+        help="address the server listens on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        action="store",
+        dest="port",
+        type=int,
+        default=8000,
+        help="port the server listens on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        dest="jobs",
+        type=int,
+        default=0,
+        help="number of worker processes computing the tiles, "
+        "0 for all the CPUs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--tile-size",
+        action="store",
+        dest="tilesize",
+        type=int,
+        default=256,
+        help="width and height of the tiles in pixels (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-s",
+        "--skip",
+        action="store",
+        dest="s",
+        type=int,
+        default=1000,
+        help="number of iterations to skip (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-samples",
+        action="store",
+        dest="maxsamples",
+        type=int,
+        default=16384,
+        help="maximum number of final states for each r value, which grows "
+        "with the zoom level (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        action="store",
+        dest="tol",
+        type=float,
+        default=1e-9,
+        help="stop iterating the orbits converged to a cycle within this "
+        "tolerance (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-tiles",
+        action="store",
+        dest="maxtiles",
+        type=int,
+        default=1024,
+        help="number of tiles kept in memory (default: %(default)s)",
+    )
+    add_backend_arguments(parser)
+    add_cache_arguments(parser, cached="tiles")
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        dest="verbose",
+        help="log the requests",
+    )
+    add_map_definitions(parser)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.tilesize <= 0 or args.maxsamples <= 0 or args.maxtiles <= 0:
+        die(2, "the tile size, samples, and tiles must be greater than zero")
+
+    jobs = args.jobs or multiprocessing.cpu_count()
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        tiles = TileCache(
+            executor,
+            None if args.nocache else Cache(args.cachedir),
+            args.maxtiles,
+            args.tilesize,
+            args.s,
+            args.maxsamples,
+            args.tol,
+            args.backend,
+            args.precision,
+        )
+        try:
+            server = TileServer((args.host, args.port), tiles, args.verbose)
+        except OSError as e:
+            die(1, "cannot listen on %s:%d: %s" % (args.host, args.port, e))
+
+        print(
+            "Serving the tiles of the maps %s at http://%s:%d/<map>/<zoom>/<x>/<y>.png"
+            " (zoom: 0-%d)" % (", ".join(MAPS), args.host, server.server_port, MAXZOOM)
+        )
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        die(3, "Exiting on user request")
+
+    sys.exit()
@@ -12,6 +12,7 @@ __email__ = "davide.madrisan@gmail.com"
 __status__ = "stable"
 
 import argparse
+import sys
 import textwrap
 
 
@@ -24,6 +25,152 @@ def argparser(descr, examples):
     )
 
 
+def add_map_definitions(parser):
+    """Add to 'parser' the options defining the user maps, and register the
+    user maps defined on the command line in the registry lelib.MAPS (the
+    options are parsed here first, so that the maps are known before the
+    remaining options are set)"""
+
+    from lelib import define_map, load_maps
+
+    def add_definitions(parser):
+        parser.add_argument(
+            "--map-file",
+            action="append",
+            dest="map_files",
+            default=[],
+            metavar="FILE",
+            help="define the user maps described in a configuration file",
+        )
+        parser.add_argument(
+            "--define-map",
+            action="append",
+            dest="map_definitions",
+            default=[],
+            nargs=4,
+            metavar=("NAME", "EXPRESSION", "R", "Y"),
+            help='define a user map, for instance: quadratic "r*x*(1-x)**2" 0:6.75 0:1',
+        )
+
+    preparser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    add_definitions(preparser)
+    known = preparser.parse_known_args()[0]
+
+    try:
+        for filename in known.map_files:
+            load_maps(filename)
+        for name, expression, r, y in known.map_definitions:
+            define_map(
+                name,
+                expression,
+                [float(i) for i in r.split(":")],
+                [float(i) for i in y.split(":")],
+            )
+    except (IOError, ValueError) as e:
+        die(2, str(e))
+
+    add_definitions(parser)
+
+
+def add_map_argument(parser):
+    """Add to 'parser' the option --map, whose choices are the maps of the
+    registry lelib.MAPS, along with the options defining the user maps"""
+
+    from lelib import MAPS
+
+    add_map_definitions(parser)
+    parser.add_argument(
+        "-m",
+        "--map",
+        action="store",
+        dest="map_name",
+        default="logistic",
+        choices=list(MAPS),
+        help="select the desired map (%s)" % ", ".join(MAPS),
+    )
+
+
+def add_backend_arguments(parser, backend=True):
+    """Add to 'parser' the options --backend (unless 'backend' is False)
+    and --precision, selecting how the orbits are iterated"""
+
+    from lelib import BACKENDS, PRECISIONS
+
+    if backend:
+        parser.add_argument(
+            "--backend",
+            action="store",
+            dest="backend",
+            default="auto",
+            choices=BACKENDS,
+            help="select the backend used for iterating the maps "
+            "(default: %(default)s)",
+        )
+    parser.add_argument(
+        "--precision",
+        action="store",
+        dest="precision",
+        default="float64",
+        choices=PRECISIONS,
+        help="select the floating point type of the orbits (default: %(default)s)",
+    )
+
+
+def add_cache_arguments(parser, cached="results"):
+    """Add to 'parser' the options --cache-dir and --no-cache of the cache
+    of the 'cached' objects"""
+
+    from lecache import default_cachedir
+
+    parser.add_argument(
+        "--cache-dir",
+        action="store",
+        dest="cachedir",
+        help="directory of the %s cache (default: %s)" % (cached, default_cachedir()),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        dest="nocache",
+        help="do not read or store the %s in the cache" % cached,
+    )
+
+
+def add_output_arguments(parser, exported="data"):
+    """Add to 'parser' the options --export (of the computed 'exported'),
+    --profile, --output, and --dpi"""
+
+    parser.add_argument(
+        "-x",
+        "--export",
+        action="store",
+        dest="export",
+        help="export the computed %s to a (npz, h5, or parquet) file "
+        "and do not display the plot" % exported,
+    )
+    parser.add_argument(
+        "--profile",
+        action="store",
+        dest="profile",
+        help="write the time and memory spent in each phase to a JSON file",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        action="store",
+        dest="output",
+        help="save the plot to a (png, svg, or pdf) file instead of displaying it",
+    )
+    parser.add_argument(
+        "--dpi",
+        action="store",
+        dest="dpi",
+        type=int,
+        default=100,
+        help="resolution of the saved plot in dots per inch (default: %(default)s)",
+    )
+
+
 def copyleft(descr):
     """Print the Copyright message and License"""
 
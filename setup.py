@@ -44,14 +44,22 @@ setup(
     license="Apache License 2.0",
     packages=["dynamic-systems-and-chaos"],
     scripts=[
+        "dynamic-systems-and-chaos/attractor.py",
         "dynamic-systems-and-chaos/bifurcations.py",
+        "dynamic-systems-and-chaos/cycles.py",
         "dynamic-systems-and-chaos/finalstate.py",
         "dynamic-systems-and-chaos/legraph.py",
+        "dynamic-systems-and-chaos/parameterplane.py",
+        "dynamic-systems-and-chaos/tileserver.py",
     ],
     classifiers=[_f for _f in CLASSIFIERS.split("\n") if _f],
     install_requires=[
         "numpy",
         "matplotlib",
     ],
+    extras_require={
+        "jit": ["numba"],
+        "export": ["h5py", "pyarrow"],
+    },
     platforms=["Linux", "Mac OS-X", "Windows"],
 )